@@ -4,8 +4,20 @@ FreeCAD script for Asus ROG Flow Z13 2025 back shell
 PROTO version: Simple frame for dimension testing
 """
 
+import hashlib
+import inspect
+import os
+import sys
+import tempfile
+
 import FreeCAD as App
 import Part
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, FreeCAD does not ship it
+    njit = None
 
 # Tablet parameters (exact Z13 2025 dimensions)
 TABLET_WIDTH = 300.0  # mm
@@ -17,211 +29,408 @@ SHELL_THICKNESS = 3.0  # mm - wall thickness (v1.1.0: increased for rigidity)
 CLEARANCE = 0.5  # mm - gap between tablet and shell
 LIP_HEIGHT = 8.0  # mm - lip height
 
-# Inner fillets
+# Heights for U-profile
+TABLET_SPACE = 15.0  # mm - height for tablet (15mm thickness)
+LIP_VERTICAL = 3.0   # mm - vertical thickness of lip
+
+# Lip overhang
+LIP_OVERHANG = 3.0   # mm - horizontal lip on sides and top (original value)
+LIP_OVERHANG_BOTTOM = 9.0  # mm - horizontal lip at bottom (v1.2.6: +6mm)
+
+# Remove bottom IN THE MIDDLE ONLY (save material)
+# Keep 4cm of solid material at TOP and 4cm at BOTTOM
+BOTTOM_MARGIN = 10.0  # mm - margin on sides
+SOLID_TOP_AREA = 40.0  # mm - 4cm of solid bottom at top
+SOLID_BOTTOM_AREA = 40.0  # mm - 4cm of solid bottom at bottom
+
+# Hole for rear webcam TOP LEFT (in solid area)
+# v1.2.6: Moved down 3mm and closer to edge by 2mm
+WEBCAM_FROM_TOP = 18.0  # mm - 1.8cm from top (was 1.5cm)
+WEBCAM_FROM_SIDE = 18.0  # mm - 1.8cm from left side (was 2.0cm)
+WEBCAM_RADIUS = 6.0  # mm - radius 0.6cm = diameter 1.2cm
+
+# Derived dimensions (computed once, shared by every function)
+CAVITY_WIDTH = TABLET_WIDTH + 2 * CLEARANCE  # Inner cavity = tablet size + clearance
+CAVITY_HEIGHT = TABLET_HEIGHT + 2 * CLEARANCE
+OUTER_WIDTH = CAVITY_WIDTH + 2 * SHELL_THICKNESS  # Outer box = cavity + wall thickness
+OUTER_HEIGHT = CAVITY_HEIGHT + 2 * SHELL_THICKNESS
+TOTAL_HEIGHT = SHELL_THICKNESS + TABLET_SPACE + LIP_VERTICAL
+
+# Fillets
 INNER_CORNER_RADIUS = 5.0  # mm
+OUTER_CORNER_RADIUS = 5.0  # mm
+OUTER_EDGE_RADIUS = 1.5  # mm - very light for horizontal edges
 
+# Directory of the frame cache (see frame_cache_path())
+FRAME_CACHE_DIR = tempfile.gettempdir()
 
-def create_frame_shell(doc):
-    """Creates a simple frame with U-profile - wide cavity for 15mm tablet, lip on top"""
+# Progress messages are buffered and written in one block at the end of the
+# run: in the GUI every print() goes through the Qt report view, one event each
+_log_lines = []
 
-    # CORRECTED DIMENSIONS
-    # Inner cavity = tablet size + clearance
-    cavity_width = TABLET_WIDTH + 2 * CLEARANCE
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-
-    # Outer box = cavity + wall thickness
-    outer_width = cavity_width + 2 * SHELL_THICKNESS
-    outer_height = cavity_height + 2 * SHELL_THICKNESS
-
-    # Heights for U-profile
-    TABLET_SPACE = 15.0  # mm - height for tablet (15mm thickness)
-    LIP_OVERHANG = 3.0   # mm - horizontal lip on sides and top (original value)
-    LIP_OVERHANG_BOTTOM = 9.0  # mm - horizontal lip at bottom (v1.2.6: +6mm)
-    LIP_VERTICAL = 3.0   # mm - vertical thickness of lip
-    total_height = SHELL_THICKNESS + TABLET_SPACE + LIP_VERTICAL
-
-    print(f"Outer box dimensions: {outer_width} x {outer_height} x {total_height} mm")
-    print(f"Cavity dimensions: {cavity_width} x {cavity_height} mm")
-    print(f"Tablet dimensions: {TABLET_WIDTH} x {TABLET_HEIGHT} x 15 mm")
-    print(f"Structure: Bottom {SHELL_THICKNESS}mm + Tablet space {TABLET_SPACE}mm + Lip {LIP_VERTICAL}mm")
-    
-    # Outer body
-    outer_box = Part.makeBox(outer_width, outer_height, total_height)
 
-    # WIDE CAVITY at BOTTOM: To accommodate the tablet (15mm high)
-    # From z=SHELL_THICKNESS to z=SHELL_THICKNESS+TABLET_SPACE
-    lower_cavity = Part.makeBox(
-        cavity_width,
-        cavity_height,
-        TABLET_SPACE + 0.1,
-        App.Vector(SHELL_THICKNESS, SHELL_THICKNESS, SHELL_THICKNESS)
-    )
+def log(message=""):
+    """Buffers a progress message, written out by flush_log()"""
+    _log_lines.append(str(message))
 
-    # NARROW CAVITY at TOP: With lip going inward (asymmetric: more at bottom)
-    # From z=SHELL_THICKNESS+TABLET_SPACE to z=total_height
-    upper_cavity_width = cavity_width - 2 * LIP_OVERHANG
-    upper_cavity_height = cavity_height - LIP_OVERHANG - LIP_OVERHANG_BOTTOM  # Asymmetric top/bottom
-    upper_cavity = Part.makeBox(
-        upper_cavity_width,
-        upper_cavity_height,
-        LIP_VERTICAL + 0.1,
-        App.Vector(SHELL_THICKNESS + LIP_OVERHANG, SHELL_THICKNESS + LIP_OVERHANG_BOTTOM, SHELL_THICKNESS + TABLET_SPACE)
-    )
 
-    # Remove bottom IN THE MIDDLE ONLY (save material)
-    # Keep 4cm of solid material at TOP and 4cm at BOTTOM
-    bottom_margin = 10.0  # mm - margin on sides
-    solid_top_area = 40.0  # mm - 4cm of solid bottom at top
-    solid_bottom_area = 40.0  # mm - 4cm of solid bottom at bottom
+def flush_log():
+    """Writes all buffered messages in a single write"""
+    if _log_lines:
+        sys.stdout.write("\n".join(_log_lines) + "\n")
+        del _log_lines[:]
 
-    # The hole starts 4cm after the bottom and stops 4cm before the top
-    bottom_hole_y_start = SHELL_THICKNESS + bottom_margin + solid_bottom_area
-    bottom_hole_y_size = cavity_height - 2 * bottom_margin - solid_top_area - solid_bottom_area
-
-    bottom_hole = Part.makeBox(
-        cavity_width - 2 * bottom_margin,
-        bottom_hole_y_size,
-        SHELL_THICKNESS + 0.1,
-        App.Vector(SHELL_THICKNESS + bottom_margin, bottom_hole_y_start, -0.05)
+
+def edge_endpoints(candidate_edges):
+    """Returns the edges having two vertexes with their endpoints as an (N, 2, 3) array"""
+    edges = []
+    points = []
+    for edge in candidate_edges:
+        vertexes = edge.Vertexes
+        if len(vertexes) < 2:
+            continue
+        p1 = vertexes[0].Point
+        p2 = vertexes[1].Point
+        edges.append(edge)
+        points.append(((p1.x, p1.y, p1.z), (p2.x, p2.y, p2.z)))
+
+    return edges, np.array(points, dtype=np.float64).reshape(-1, 2, 3)
+
+
+def flat_face_edges(shape, z_levels, tol=0.1):
+    """Returns the edges of the horizontal faces lying at one of the z levels
+
+    OCCT's TopExp explorers are not exposed to Python, but walking the few
+    faces and keeping only those at the requested heights is much cheaper than
+    pulling every edge of the shape through the bindings.
+    """
+    edges = []
+    for face in shape.Faces:
+        bbox = face.BoundBox
+        if bbox.ZLength < 0.001 and any(abs(bbox.ZMin - z) < tol for z in z_levels):
+            edges.extend(face.Edges)
+    return edges
+
+
+def near_any(points_xy, targets, tol=0.1):
+    """Mask of the (x, y) points lying within tol of any of the target (x, y) pairs"""
+    diff = np.abs(points_xy[:, None, :] - targets[None, :, :])
+    return np.any(np.all(diff < tol, axis=2), axis=1)
+
+
+def classify_edges_numpy(pts, outer_width, outer_height, shell_thickness, tablet_space, total_height):
+    """Classifies edges for the fillet passes (vectorized NumPy version)
+
+    pts is the (N, 2, 3) endpoint array from edge_endpoints(). Returns three
+    boolean masks: (inner corners, outer vertical corners, outer horizontal edges)
+    """
+    # Vertical edges
+    is_vertical = np.abs(pts[:, 0, :2] - pts[:, 1, :2]).max(axis=1) < 0.001
+
+    # INNER corners of the wide cavity (at bottom)
+    inner_corners = np.array([
+        (shell_thickness, shell_thickness),
+        (shell_thickness, outer_height - shell_thickness),
+        (outer_width - shell_thickness, shell_thickness),
+        (outer_width - shell_thickness, outer_height - shell_thickness),
+    ])
+    is_inner_corner = near_any(pts[:, 0, :2], inner_corners)
+
+    # Inner edges (lower part only)
+    z = pts[:, 0, 2]
+    in_lower_part = (z > shell_thickness - 0.5) & (z < shell_thickness + tablet_space + 0.5)
+
+    # OUTER corners of the box
+    outer_corners = np.array([
+        (0.0, 0.0),
+        (0.0, outer_height),
+        (outer_width, 0.0),
+        (outer_width, outer_height),
+    ])
+    is_outer_corner = near_any(pts[:, 0, :2], outer_corners)
+
+    # HORIZONTAL outer edges (top and bottom edges, on outer faces of the box)
+    is_horizontal = np.abs(pts[:, 0, 2] - pts[:, 1, 2]) < 0.001
+    p_min = pts.min(axis=1)
+    p_max = pts.max(axis=1)
+    is_top_or_bottom = (np.abs(z - total_height) < 0.1) | (np.abs(z) < 0.1)
+    is_outer_side = (
+        (np.abs(p_min[:, 0]) < 0.1) | (np.abs(p_max[:, 0] - outer_width) < 0.1) |  # Left or right side
+        (np.abs(p_min[:, 1]) < 0.1) | (np.abs(p_max[:, 1] - outer_height) < 0.1)    # Front or back side
     )
 
-    # Subtract all cavities
-    shell_shape = outer_box.cut(lower_cavity).cut(upper_cavity).cut(bottom_hole)
+    return (
+        is_vertical & is_inner_corner & in_lower_part,
+        is_vertical & is_outer_corner,
+        is_horizontal & is_top_or_bottom & is_outer_side,
+    )
 
-    # Hole for rear webcam TOP LEFT (in solid area)
-    # v1.2.6: Moved down 3mm and closer to edge by 2mm
-    WEBCAM_FROM_TOP = 18.0  # mm - 1.8cm from top (was 1.5cm)
-    WEBCAM_FROM_SIDE = 18.0  # mm - 1.8cm from left side (was 2.0cm)
-    WEBCAM_RADIUS = 6.0  # mm - radius 0.6cm = diameter 1.2cm
 
-    # Left camera position (top left)
-    webcam_x = SHELL_THICKNESS + WEBCAM_FROM_SIDE
-    webcam_y = outer_height - SHELL_THICKNESS - WEBCAM_FROM_TOP
+def classify_edges_kernel(pts, outer_width, outer_height, shell_thickness, tablet_space, total_height):
+    """Same classification as classify_edges_numpy(), as a plain loop for numba"""
+    n = pts.shape[0]
+    inner = np.zeros(n, dtype=np.bool_)
+    outer_vertical = np.zeros(n, dtype=np.bool_)
+    outer_horizontal = np.zeros(n, dtype=np.bool_)
 
-    webcam_hole = Part.makeCylinder(
-        WEBCAM_RADIUS,
-        SHELL_THICKNESS + 1,
-        App.Vector(webcam_x, webcam_y, -0.5),
-        App.Vector(0, 0, 1)
-    )
+    for i in range(n):
+        x1, y1, z1 = pts[i, 0, 0], pts[i, 0, 1], pts[i, 0, 2]
+        x2, y2, z2 = pts[i, 1, 0], pts[i, 1, 1], pts[i, 1, 2]
 
-    # Subtract webcam hole
-    shell_shape = shell_shape.cut(webcam_hole)
-    
-    # === APPLY FILLETS IN 3 SEPARATE PASSES ===
+        # Vertical edge
+        if abs(x1 - x2) < 0.001 and abs(y1 - y2) < 0.001:
+            # INNER corners of the wide cavity (lower part only)
+            if ((abs(x1 - shell_thickness) < 0.1 or abs(x1 - (outer_width - shell_thickness)) < 0.1) and
+                    (abs(y1 - shell_thickness) < 0.1 or abs(y1 - (outer_height - shell_thickness)) < 0.1) and
+                    shell_thickness - 0.5 < z1 < shell_thickness + tablet_space + 0.5):
+                inner[i] = True
 
-    # PASS 1: Inner cavity fillets
-    print("Applying inner fillets...")
-    edges_to_fillet_inner = []
+            # OUTER corners of the box
+            if ((abs(x1) < 0.1 or abs(x1 - outer_width) < 0.1) and
+                    (abs(y1) < 0.1 or abs(y1 - outer_height) < 0.1)):
+                outer_vertical[i] = True
+
+        # HORIZONTAL outer edges (top or bottom, on outer faces of the box)
+        if abs(z1 - z2) < 0.001 and (abs(z1 - total_height) < 0.1 or abs(z1) < 0.1):
+            if (abs(min(x1, x2)) < 0.1 or abs(max(x1, x2) - outer_width) < 0.1 or
+                    abs(min(y1, y2)) < 0.1 or abs(max(y1, y2) - outer_height) < 0.1):
+                outer_horizontal[i] = True
+
+    return inner, outer_vertical, outer_horizontal
+
+
+# JIT-compile the loop kernel when numba is available, otherwise use NumPy
+classify_edges = classify_edges_numpy
+if njit is not None:
+    try:
+        classify_edges = njit(cache=True)(classify_edges_kernel)
+    except Exception:  # no cache locator when run as a macro from memory
+        classify_edges = njit(classify_edges_kernel)
+
+
+def select_fillet_edges(candidate_edges):
+    """Sorts edges into the fillet groups in a single walk over the edge list
+
+    Returns three edge lists: (inner corners, outer vertical corners, outer horizontal edges)
+    """
+    edges, pts = edge_endpoints(candidate_edges)
+    masks = classify_edges(pts, OUTER_WIDTH, OUTER_HEIGHT, SHELL_THICKNESS, TABLET_SPACE, TOTAL_HEIGHT)
+    return tuple([edges[i] for i in np.flatnonzero(mask)] for mask in masks)
+
+
+def make_rect_wire(x, y, width, height, z=0.0):
+    """Creates a closed rectangular wire in the XY plane, minimum corner at (x, y, z)"""
+    return Part.makePolygon([
+        App.Vector(x, y, z),
+        App.Vector(x + width, y, z),
+        App.Vector(x + width, y + height, z),
+        App.Vector(x, y + height, z),
+        App.Vector(x, y, z),
+    ])
+
+
+def make_plate(outer_wire, hole_wires, thickness):
+    """Extrudes a planar face with holes along +Z"""
+    face = Part.makeFace([outer_wire] + list(hole_wires), "Part::FaceMakerBullseye")
+    return face.extrude(App.Vector(0, 0, thickness))
+
+
+def boolean_cut(shape, tools):
+    """Subtracts all tools from shape in a single OCCT boolean.
+
+    FreeCAD does not expose BRepAlgoAPI_Cut::SetToFillHistory() to Python, so
+    history cannot be switched off here; the next best thing is to run one BOP
+    per result, so that the history is built once instead of once per tool.
+    Passing the tools as a list also makes FreeCAD run the BOP in parallel mode.
+    """
+    return shape.cut(list(tools))
+
+
+def frame_cache_path():
+    """Returns the .brep cache path of the frame
+
+    The key is every frame parameter plus the source of build_frame_shape() and
+    of the helpers it calls: any change to the frame construction code gives a
+    new key, while editing the cutouts still reuses the cached frame. Returns
+    None when that source cannot be read, which disables the cache.
+    """
+    try:
+        source = "".join(inspect.getsource(function) for function in (
+            build_frame_shape, make_plate, make_rect_wire, select_fillet_edges, edge_endpoints,
+            flat_face_edges, near_any, classify_edges_numpy, classify_edges_kernel,
+        ))
+    except (OSError, TypeError):
+        return None
+
+    params = (
+        source,
+        TABLET_WIDTH, TABLET_HEIGHT, SHELL_THICKNESS, CLEARANCE, LIP_HEIGHT,
+        TABLET_SPACE, LIP_VERTICAL, LIP_OVERHANG, LIP_OVERHANG_BOTTOM,
+        BOTTOM_MARGIN, SOLID_TOP_AREA, SOLID_BOTTOM_AREA,
+        WEBCAM_FROM_TOP, WEBCAM_FROM_SIDE, WEBCAM_RADIUS,
+        INNER_CORNER_RADIUS, OUTER_CORNER_RADIUS, OUTER_EDGE_RADIUS,
+    )
+    key = hashlib.blake2b(repr(params).encode(), digest_size=16).hexdigest()
+    return os.path.join(FRAME_CACHE_DIR, f"z13_frame_{key}.brep")
 
-    for edge in shell_shape.Edges:
-        if len(edge.Vertexes) < 2:
-            continue
 
-        p1 = edge.Vertexes[0].Point
-        p2 = edge.Vertexes[1].Point
+def load_frame_shape():
+    """Returns the filleted frame shape, from the .brep cache when parameters are unchanged"""
+    path = frame_cache_path()
 
-        # Vertical edge
-        if abs(p1.x - p2.x) < 0.001 and abs(p1.y - p2.y) < 0.001:
-            x = p1.x
-            y = p1.y
-            z = p1.z
-
-            # INNER corners of the wide cavity (at bottom)
-            is_inner_corner = (
-                (abs(x - SHELL_THICKNESS) < 0.1 and abs(y - SHELL_THICKNESS) < 0.1) or
-                (abs(x - SHELL_THICKNESS) < 0.1 and abs(y - (outer_height - SHELL_THICKNESS)) < 0.1) or
-                (abs(x - (outer_width - SHELL_THICKNESS)) < 0.1 and abs(y - SHELL_THICKNESS) < 0.1) or
-                (abs(x - (outer_width - SHELL_THICKNESS)) < 0.1 and abs(y - (outer_height - SHELL_THICKNESS)) < 0.1)
-            )
-
-            # Inner edges (lower part only)
-            if is_inner_corner and z > SHELL_THICKNESS - 0.5 and z < SHELL_THICKNESS + TABLET_SPACE + 0.5:
-                edges_to_fillet_inner.append(edge)
-
-    if edges_to_fillet_inner and INNER_CORNER_RADIUS > 0:
+    if path is not None and os.path.exists(path):
         try:
-            shell_shape = shell_shape.makeFillet(INNER_CORNER_RADIUS, edges_to_fillet_inner)
-            print(f"  -> {len(edges_to_fillet_inner)} inner edges filleted")
+            shell_shape = Part.Shape()
+            shell_shape.read(path)
+            if not shell_shape.isNull():
+                log(f"  -> Frame loaded from cache: {path}")
+                return shell_shape
         except Exception as e:
-            print(f"  Warning: Inner fillet error: {e}")
+            log(f"  Warning: Frame cache unreadable, rebuilding: {e}")
 
-    # PASS 2: Outer vertical fillets (corners)
-    print("Applying outer vertical fillets...")
-    edges_to_fillet_outer_vertical = []
+    shell_shape, fully_filleted = build_frame_shape()
 
-    for edge in shell_shape.Edges:
-        if len(edge.Vertexes) < 2:
-            continue
+    # A frame missing some fillets is not cached, otherwise the next runs
+    # would silently reuse it without the fillet warnings
+    if not fully_filleted:
+        log("  Warning: Frame not cached, some fillets failed")
+        return shell_shape
 
-        p1 = edge.Vertexes[0].Point
-        p2 = edge.Vertexes[1].Point
+    if path is None:
+        return shell_shape
 
-        # Vertical edge
-        if abs(p1.x - p2.x) < 0.001 and abs(p1.y - p2.y) < 0.001:
-            x = p1.x
-            y = p1.y
+    try:
+        shell_shape.exportBrep(path)
+    except Exception as e:
+        log(f"  Warning: Frame cache not written: {e}")
 
-            # OUTER corners of the box
-            is_outer_corner = (
-                (abs(x) < 0.1 and abs(y) < 0.1) or
-                (abs(x) < 0.1 and abs(y - outer_height) < 0.1) or
-                (abs(x - outer_width) < 0.1 and abs(y) < 0.1) or
-                (abs(x - outer_width) < 0.1 and abs(y - outer_height) < 0.1)
-            )
-
-            if is_outer_corner:
-                edges_to_fillet_outer_vertical.append(edge)
-
-    OUTER_CORNER_RADIUS = 5.0  # mm
-    if edges_to_fillet_outer_vertical and OUTER_CORNER_RADIUS > 0:
-        try:
-            shell_shape = shell_shape.makeFillet(OUTER_CORNER_RADIUS, edges_to_fillet_outer_vertical)
-            print(f"  -> {len(edges_to_fillet_outer_vertical)} outer corners filleted")
-        except Exception as e:
-            print(f"  Warning: Vertical fillet error: {e}")
+    return shell_shape
 
-    # PASS 3: Outer horizontal fillets (light edges)
-    print("Applying outer horizontal fillets...")
-    edges_to_fillet_outer_horizontal = []
 
-    for edge in shell_shape.Edges:
-        if len(edge.Vertexes) < 2:
-            continue
+def build_frame_shape():
+    """Builds the filleted U-profile frame shape - wide cavity for 15mm tablet, lip on top
+
+    Returns (shape, fully_filleted), fully_filleted being False when a fillet pass failed.
+    """
+
+    # === FLOOR: perforated plate extruded from a 2D profile (no boolean) ===
+
+    # The hole starts 4cm after the bottom and stops 4cm before the top
+    bottom_hole_y_start = SHELL_THICKNESS + BOTTOM_MARGIN + SOLID_BOTTOM_AREA
+    bottom_hole_y_size = CAVITY_HEIGHT - 2 * BOTTOM_MARGIN - SOLID_TOP_AREA - SOLID_BOTTOM_AREA
+
+    bottom_hole_wire = make_rect_wire(
+        SHELL_THICKNESS + BOTTOM_MARGIN,
+        bottom_hole_y_start,
+        CAVITY_WIDTH - 2 * BOTTOM_MARGIN,
+        bottom_hole_y_size
+    )
+
+    # Left camera position (top left)
+    webcam_x = SHELL_THICKNESS + WEBCAM_FROM_SIDE
+    webcam_y = OUTER_HEIGHT - SHELL_THICKNESS - WEBCAM_FROM_TOP
+
+    webcam_wire = Part.Wire(Part.makeCircle(WEBCAM_RADIUS, App.Vector(webcam_x, webcam_y, 0), App.Vector(0, 0, 1)))
+
+    floor = make_plate(
+        make_rect_wire(0, 0, OUTER_WIDTH, OUTER_HEIGHT),
+        [bottom_hole_wire, webcam_wire],
+        SHELL_THICKNESS
+    )
+
+    # === WALLS: outer rectangle minus the cavity, extruded over the tablet space ===
+    # WIDE CAVITY at BOTTOM: To accommodate the tablet (15mm high)
+    # From z=SHELL_THICKNESS to z=SHELL_THICKNESS+TABLET_SPACE+0.1 (0.1mm vertical play)
+    walls = make_plate(
+        make_rect_wire(0, 0, OUTER_WIDTH, OUTER_HEIGHT, SHELL_THICKNESS),
+        [make_rect_wire(SHELL_THICKNESS, SHELL_THICKNESS, CAVITY_WIDTH, CAVITY_HEIGHT, SHELL_THICKNESS)],
+        TABLET_SPACE + 0.1
+    )
+
+    # === LIP: outer rectangle minus the narrow cavity, on top of the walls ===
+    # NARROW CAVITY at TOP: With lip going inward (asymmetric: more at bottom)
+    # From z=SHELL_THICKNESS+TABLET_SPACE+0.1 to z=TOTAL_HEIGHT
+    upper_cavity_width = CAVITY_WIDTH - 2 * LIP_OVERHANG
+    upper_cavity_height = CAVITY_HEIGHT - LIP_OVERHANG - LIP_OVERHANG_BOTTOM  # Asymmetric top/bottom
+    lip_z = SHELL_THICKNESS + TABLET_SPACE + 0.1
+    lip = make_plate(
+        make_rect_wire(0, 0, OUTER_WIDTH, OUTER_HEIGHT, lip_z),
+        [make_rect_wire(SHELL_THICKNESS + LIP_OVERHANG, SHELL_THICKNESS + LIP_OVERHANG_BOTTOM,
+                        upper_cavity_width, upper_cavity_height, lip_z)],
+        LIP_VERTICAL - 0.1
+    )
+
+    # The three extrusions only touch on planes: a single fuse glues them and
+    # removeSplitter() merges the coplanar outer faces so the corner edges
+    # stay single edges for the fillets
+    shell_shape = floor.fuse([walls, lip]).removeSplitter()
+    
+    # === APPLY FILLETS ===
+    # All three edge groups are classified once, on the unfilleted shape. Inner
+    # and outer vertical edges are filleted together when their radii match
+    # (one BRep rebuild instead of two)
+
+    # PASS 1: Inner cavity and outer vertical fillets (corners)
+    log("Applying inner and outer vertical fillets...")
+    (edges_to_fillet_inner,
+     edges_to_fillet_outer_vertical,
+     edges_to_fillet_outer_horizontal) = select_fillet_edges(shell_shape.Edges)
+
+    # Group edges by radius
+    fillet_groups = {}
+    for radius, group in ((INNER_CORNER_RADIUS, edges_to_fillet_inner),
+                          (OUTER_CORNER_RADIUS, edges_to_fillet_outer_vertical)):
+        if group and radius > 0:
+            fillet_groups.setdefault(radius, []).extend(group)
+
+    fully_filleted = True
+    topology_changed = False
+    for radius, group in fillet_groups.items():
+        try:
+            shell_shape = shell_shape.makeFillet(radius, group)
+            topology_changed = True
+            log(f"  -> {len(group)} vertical edges filleted ({radius}mm)")
+        except Exception as e:
+            log(f"  Warning: Vertical fillet error ({radius}mm): {e}")
+            fully_filleted = False
+
+    # PASS 2: Outer horizontal fillets (light edges)
+    # makeFillet() returns a new shape whose horizontal edges were trimmed by the
+    # corner fillets: the edges classified above no longer belong to it, so they
+    # are only reused when no corner fillet was applied. Otherwise only the edges
+    # of the bottom and top faces are reclassified, they are the only ones that can match.
+    log("Applying outer horizontal fillets...")
+    if topology_changed:
+        _, _, edges_to_fillet_outer_horizontal = select_fillet_edges(
+            flat_face_edges(shell_shape, (0.0, TOTAL_HEIGHT))
+        )
 
-        p1 = edge.Vertexes[0].Point
-        p2 = edge.Vertexes[1].Point
-
-        # HORIZONTAL outer edges (top and bottom edges)
-        if abs(p1.z - p2.z) < 0.001:
-            z = p1.z
-            x_min = min(p1.x, p2.x)
-            x_max = max(p1.x, p2.x)
-            y_min = min(p1.y, p2.y)
-            y_max = max(p1.y, p2.y)
-
-            # Outer edges (on outer faces of the box)
-            is_outer_edge = (
-                (abs(z - total_height) < 0.1 or abs(z) < 0.1) and  # Top or bottom
-                (
-                    abs(x_min) < 0.1 or abs(x_max - outer_width) < 0.1 or  # Left or right side
-                    abs(y_min) < 0.1 or abs(y_max - outer_height) < 0.1    # Front or back side
-                )
-            )
-
-            if is_outer_edge:
-                edges_to_fillet_outer_horizontal.append(edge)
-
-    OUTER_EDGE_RADIUS = 1.5  # mm - very light for horizontal edges
     if edges_to_fillet_outer_horizontal and OUTER_EDGE_RADIUS > 0:
         try:
             shell_shape = shell_shape.makeFillet(OUTER_EDGE_RADIUS, edges_to_fillet_outer_horizontal)
-            print(f"  -> {len(edges_to_fillet_outer_horizontal)} horizontal edges filleted")
+            log(f"  -> {len(edges_to_fillet_outer_horizontal)} horizontal edges filleted")
         except Exception as e:
-            print(f"  Warning: Horizontal fillet error: {e}")
-    
+            log(f"  Warning: Horizontal fillet error: {e}")
+            fully_filleted = False
+
+    return shell_shape, fully_filleted
+
+
+def create_frame_shell(doc):
+    """Creates a simple frame with U-profile - wide cavity for 15mm tablet, lip on top"""
+
+    log(f"Outer box dimensions: {OUTER_WIDTH} x {OUTER_HEIGHT} x {TOTAL_HEIGHT} mm")
+    log(f"Cavity dimensions: {CAVITY_WIDTH} x {CAVITY_HEIGHT} mm")
+    log(f"Tablet dimensions: {TABLET_WIDTH} x {TABLET_HEIGHT} x 15 mm")
+    log(f"Structure: Bottom {SHELL_THICKNESS}mm + Tablet space {TABLET_SPACE}mm + Lip {LIP_VERTICAL}mm")
+
+    # Reuse the frame of a previous run when no frame parameter changed
+    # (typical when only iterating on the cutouts)
+    shell_shape = load_frame_shape()
+
     shell = doc.addObject("Part::Feature", "Complete_Frame_U_Profile")
     shell.Shape = shell_shape
+    shell.purgeTouched()  # Shape is final, nothing to recompute
     
     return shell
 
@@ -230,16 +439,13 @@ def create_all_cutouts_left(doc):
     """Creates all objects to subtract for the left part"""
     cutouts = []
 
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-
     # Cutout 1: Main ports (USB, HDMI, power) AT TOP
     # v1.2.6: Moved up 2mm and enlarged
     PORT_START_FROM_TOP = 23.0  # mm - 2.3cm from top (was 2.5cm)
     PORT_CUT_LENGTH = 74.0  # mm - 7.4cm length (was 7.2cm)
 
-    port_y_start = cavity_height + SHELL_THICKNESS - PORT_START_FROM_TOP - PORT_CUT_LENGTH
+    port_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - PORT_START_FROM_TOP - PORT_CUT_LENGTH
 
-    TABLET_SPACE = 15.0  # mm
     port_cut_height = TABLET_SPACE + 1  # mm - goes through entire vertical lip
     port_cut_width = 8.0  # mm
 
@@ -255,7 +461,7 @@ def create_all_cutouts_left(doc):
     PORT2_START_FROM_TOP = 145.0  # mm - 14.5cm from top
     PORT2_CUT_LENGTH = 20.0  # mm - 2cm length (16.5 - 14.5)
 
-    port2_y_start = cavity_height + SHELL_THICKNESS - PORT2_START_FROM_TOP - PORT2_CUT_LENGTH
+    port2_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - PORT2_START_FROM_TOP - PORT2_CUT_LENGTH
 
     ports_cutout2 = Part.makeBox(
         port_cut_width,
@@ -273,12 +479,12 @@ def create_all_cutouts_left(doc):
     KICKSTAND_LENGTH = KICKSTAND_END - KICKSTAND_START  # 5.5cm
 
     # Y position (from top to bottom)
-    kickstand_y_start = cavity_height + SHELL_THICKNESS - KICKSTAND_END
+    kickstand_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - KICKSTAND_END
 
     kickstand_width = 10.0  # mm - notch width
 
     # The notch must be in the central hole area, not in the margin!
-    # bottom_margin = 10mm, so the lip goes from x=3mm to x=13mm
+    # BOTTOM_MARGIN = 10mm, so the lip goes from x=3mm to x=13mm
     kickstand_x_start = SHELL_THICKNESS  # x=0mm (after lip)
 
     kickstand_cutout = Part.makeBox(
@@ -293,13 +499,11 @@ def create_all_cutouts_left(doc):
 
 
 def create_ventilation_cutouts_top(doc):
-    """Creates circular holes (6mm diameter) on the upper short edge for ventilation (BOTH SIDES)"""
-    cutouts = []
+    """Creates circular holes (6mm diameter) on the upper short edge for ventilation (BOTH SIDES)
 
-    cavity_width = TABLET_WIDTH + 2 * CLEARANCE
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-    outer_height = cavity_height + 2 * SHELL_THICKNESS
-    outer_width = cavity_width + 2 * SHELL_THICKNESS
+    Returns the holes split by half: (left_vents, right_vents)
+    """
+    cutouts = []
 
     # Ventilation zone: from 1.5cm to 8cm from edge
     VENT_START_FROM_EDGE = 15.0  # mm - 1.5cm from edge
@@ -309,71 +513,64 @@ def create_ventilation_cutouts_top(doc):
     HOLE_RADIUS = 3.0  # mm - radius 3mm = diameter 6mm
     HOLE_SPACING = 8.0  # mm - spacing between holes (reduced for more ventilation)
 
-    TABLET_SPACE = 15.0  # mm
-
     # Upper wall height
     wall_thickness = 8.0  # mm - upper wall thickness
 
     # Z position (middle of lip height)
     hole_z = SHELL_THICKNESS + TABLET_SPACE / 2
 
+    # Template hole at x=0: horizontal circular hole (cylinder oriented in Y)
+    # Every hole is the template moved to a new location: translated() shares the
+    # cylinder geometry, so the BRep is only built once
+    hole_template = Part.makeCylinder(
+        HOLE_RADIUS,
+        wall_thickness + 1,
+        App.Vector(0, OUTER_HEIGHT - wall_thickness - 0.5, hole_z),
+        App.Vector(0, 1, 0)  # Oriented forward
+    )
+
     # LEFT SIDE: Create holes from 1.5cm to 8cm from left edge
     x_position = VENT_START_FROM_EDGE + SHELL_THICKNESS + HOLE_RADIUS
 
     while x_position + HOLE_RADIUS < VENT_END_FROM_EDGE + SHELL_THICKNESS:
-        # Horizontal circular hole (cylinder oriented in Y)
-        hole = Part.makeCylinder(
-            HOLE_RADIUS,
-            wall_thickness + 1,
-            App.Vector(x_position, outer_height - wall_thickness - 0.5, hole_z),
-            App.Vector(0, 1, 0)  # Oriented forward
-        )
-        cutouts.append(hole)
+        cutouts.append(hole_template.translated(App.Vector(x_position, 0, 0)))
 
         x_position += HOLE_SPACING
 
     # RIGHT SIDE: Create same holes symmetrically (from 1.5cm to 8cm from right edge)
-    x_position = outer_width - VENT_END_FROM_EDGE - SHELL_THICKNESS - HOLE_RADIUS
-
-    while x_position + HOLE_RADIUS < outer_width - VENT_START_FROM_EDGE - SHELL_THICKNESS:
-        # Horizontal circular hole (cylinder oriented in Y)
-        hole = Part.makeCylinder(
-            HOLE_RADIUS,
-            wall_thickness + 1,
-            App.Vector(x_position, outer_height - wall_thickness - 0.5, hole_z),
-            App.Vector(0, 1, 0)  # Oriented forward
-        )
-        cutouts.append(hole)
+    x_position = OUTER_WIDTH - VENT_END_FROM_EDGE - SHELL_THICKNESS - HOLE_RADIUS
+
+    while x_position + HOLE_RADIUS < OUTER_WIDTH - VENT_START_FROM_EDGE - SHELL_THICKNESS:
+        cutouts.append(hole_template.translated(App.Vector(x_position, 0, 0)))
 
         x_position += HOLE_SPACING
 
-    return cutouts
+    # Each hole is only cut from the half it lies in (holes straddling the split go to both)
+    left_vents = [hole for hole in cutouts if hole.BoundBox.XMin < OUTER_WIDTH / 2]
+    right_vents = [hole for hole in cutouts if hole.BoundBox.XMax > OUTER_WIDTH / 2]
+
+    return left_vents, right_vents
 
 
 def create_all_cutouts_right(doc):
     """Creates all objects to subtract for the right part (mirror of left)"""
     cutouts = []
 
-    cavity_width = TABLET_WIDTH + 2 * CLEARANCE
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-    outer_width = cavity_width + 2 * SHELL_THICKNESS
-
     # Cutout 1: Main ports AT TOP (mirror of left side)
     PORT_START_FROM_TOP = 20.0  # mm - 2.0cm from top
     PORT_CUT_LENGTH = 72.0  # mm - 7.2cm length
 
-    port_y_start = cavity_height + SHELL_THICKNESS - PORT_START_FROM_TOP - PORT_CUT_LENGTH
+    port_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - PORT_START_FROM_TOP - PORT_CUT_LENGTH
 
-    TABLET_SPACE = 15.0  # mm
     port_cut_height = TABLET_SPACE + 1  # mm - goes through entire vertical lip
     port_cut_width = 8.0  # mm
 
-    # Position on RIGHT edge (x = outer_width instead of x = -1)
+    # Position on RIGHT edge (x = OUTER_WIDTH instead of x = -1)
     ports_cutout = Part.makeBox(
         port_cut_width,   # Width (depth into wall)
         PORT_CUT_LENGTH,  # Length along edge
         port_cut_height,  # Height (goes through lip)
-        App.Vector(outer_width - port_cut_width + 1, port_y_start, SHELL_THICKNESS)  # Starts ABOVE bottom
+        App.Vector(OUTER_WIDTH - port_cut_width + 1, port_y_start, SHELL_THICKNESS)  # Starts ABOVE bottom
     )
     cutouts.append(ports_cutout)
 
@@ -381,13 +578,13 @@ def create_all_cutouts_right(doc):
     PORT2_START_FROM_TOP = 138.0  # mm - 13.8cm from top (was 14.0cm)
     PORT2_CUT_LENGTH = 37.0  # mm - 3.7cm length (was 3.5cm)
 
-    port2_y_start = cavity_height + SHELL_THICKNESS - PORT2_START_FROM_TOP - PORT2_CUT_LENGTH
+    port2_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - PORT2_START_FROM_TOP - PORT2_CUT_LENGTH
 
     ports_cutout2 = Part.makeBox(
         port_cut_width,
         PORT2_CUT_LENGTH,
         port_cut_height,
-        App.Vector(outer_width - port_cut_width + 1, port2_y_start, SHELL_THICKNESS)  # Starts ABOVE bottom
+        App.Vector(OUTER_WIDTH - port_cut_width + 1, port2_y_start, SHELL_THICKNESS)  # Starts ABOVE bottom
     )
     cutouts.append(ports_cutout2)
 
@@ -399,7 +596,7 @@ def create_all_cutouts_right(doc):
     KICKSTAND_LENGTH = KICKSTAND_END - KICKSTAND_START  # 5.5cm
 
     # Y position (from top to bottom)
-    kickstand_y_start = cavity_height + SHELL_THICKNESS - KICKSTAND_END
+    kickstand_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - KICKSTAND_END
 
     kickstand_width = 10.0  # mm - notch width
 
@@ -407,134 +604,111 @@ def create_all_cutouts_right(doc):
         kickstand_width,      # Width
         KICKSTAND_LENGTH,     # Length (5.5cm)
         SHELL_THICKNESS + 1,  # Goes through entire bottom
-        App.Vector(outer_width - SHELL_THICKNESS - kickstand_width, kickstand_y_start, -0.5)  # FIXED: ends BEFORE lip
+        App.Vector(OUTER_WIDTH - SHELL_THICKNESS - kickstand_width, kickstand_y_start, -0.5)  # FIXED: ends BEFORE lip
     )
     cutouts.append(kickstand_cutout)
 
     return cutouts
 
 
+def v_profile(origin, u_axis, v_axis, width, depth):
+    """Returns a closed V-profile (apex, corner, corner, apex) as a (4, 3) array
+
+    origin is the apex, the two corners are width away along u_axis on each
+    side and depth away along v_axis.
+    """
+    origin = np.asarray(origin, dtype=np.float64)
+    u_axis = np.asarray(u_axis, dtype=np.float64)
+    v_axis = np.asarray(v_axis, dtype=np.float64)
+    return np.stack([
+        origin,
+        origin - u_axis * width + v_axis * depth,
+        origin + u_axis * width + v_axis * depth,
+        origin,
+    ])
+
+
+def to_vectors(points):
+    """Converts an (N, 3) array to a list of App.Vector"""
+    return [App.Vector(*map(float, row)) for row in points]
+
+
+def make_v_prism(v_points, direction):
+    """Creates a triangular prism from a closed V-profile and an extrusion vector"""
+    return Part.Face(Part.makePolygon(to_vectors(v_points))).extrude(direction)
+
+
 def create_welding_groove(doc, outer_width, outer_height, total_height):
-    """Creates a V-groove for PLA pen welding"""
+    """Creates the V-grooves for PLA pen welding (list of tools for a single cut)"""
 
     # Groove parameters
     GROOVE_WIDTH = 1.5  # mm - width on each side of the V
     GROOVE_DEPTH = 1.8  # mm - groove depth
     INSET_FROM_EDGE = 1.5  # mm - setback from outer edge
 
-    print(f"Creating welding groove: {GROOVE_WIDTH}mm wide x {GROOVE_DEPTH}mm deep")
+    log(f"Creating welding groove: {GROOVE_WIDTH}mm wide x {GROOVE_DEPTH}mm deep")
 
     # The groove is a triangular prism (V-section) that follows the perimeter
     # We create 4 segments: top, bottom, front, back (but not on left/right sides as that's the junction)
-
-    grooves = []
-
-    # === GROOVE ON FRONT EDGE (Y = 0) ===
-    # V-profile: triangle pointing inward, groove open toward OUTSIDE
-    v_points_front = [
-        App.Vector(outer_width/2, INSET_FROM_EDGE + GROOVE_DEPTH, 0),  # V apex (points inward)
-        App.Vector(outer_width/2 - GROOVE_WIDTH, INSET_FROM_EDGE, 0),  # Left corner (outer surface)
-        App.Vector(outer_width/2 + GROOVE_WIDTH, INSET_FROM_EDGE, 0),  # Right corner (outer surface)
-        App.Vector(outer_width/2, INSET_FROM_EDGE + GROOVE_DEPTH, 0)   # Return to apex
+    # Each segment: (V apex, direction from apex to the V opening, extrusion vector)
+    x_axis = (1, 0, 0)
+    middle = outer_width / 2
+    segments = [
+        # FRONT EDGE (Y = 0): apex points inward, extruded over entire height
+        ((middle, INSET_FROM_EDGE + GROOVE_DEPTH, 0), (0, -1, 0), App.Vector(0, 0, total_height)),
+        # BACK EDGE (Y = outer_height)
+        ((middle, outer_height - INSET_FROM_EDGE, 0), (0, -1, 0), App.Vector(0, 0, total_height)),
+        # TOP EDGE (Z = total_height): horizontal V-profile
+        ((middle, INSET_FROM_EDGE, total_height - INSET_FROM_EDGE), (0, 0, -1),
+         App.Vector(0, outer_height - 2*INSET_FROM_EDGE, 0)),
+        # BOTTOM EDGE (Z = 0)
+        ((middle, INSET_FROM_EDGE, INSET_FROM_EDGE), (0, 0, 1),
+         App.Vector(0, outer_height - 2*INSET_FROM_EDGE, 0)),
     ]
 
-    # Create 2D V-profile
-    v_wire_front = Part.makePolygon(v_points_front)
-    v_face_front = Part.Face(v_wire_front)
-
-    # Extrude vertically over entire height
-    groove_front = v_face_front.extrude(App.Vector(0, 0, total_height))
-    grooves.append(groove_front)
-
-    # === GROOVE ON BACK EDGE (Y = outer_height) ===
-    v_points_back = [
-        App.Vector(outer_width/2, outer_height - INSET_FROM_EDGE, 0),
-        App.Vector(outer_width/2 - GROOVE_WIDTH, outer_height - INSET_FROM_EDGE - GROOVE_DEPTH, 0),
-        App.Vector(outer_width/2 + GROOVE_WIDTH, outer_height - INSET_FROM_EDGE - GROOVE_DEPTH, 0),
-        App.Vector(outer_width/2, outer_height - INSET_FROM_EDGE, 0)
-    ]
-
-    v_wire_back = Part.makePolygon(v_points_back)
-    v_face_back = Part.Face(v_wire_back)
-    groove_back = v_face_back.extrude(App.Vector(0, 0, total_height))
-    grooves.append(groove_back)
-
-    # === GROOVE ON TOP EDGE (Z = total_height) ===
-    # Horizontal V-profile
-    v_points_top = [
-        App.Vector(outer_width/2, INSET_FROM_EDGE, total_height - INSET_FROM_EDGE),
-        App.Vector(outer_width/2 - GROOVE_WIDTH, INSET_FROM_EDGE, total_height - INSET_FROM_EDGE - GROOVE_DEPTH),
-        App.Vector(outer_width/2 + GROOVE_WIDTH, INSET_FROM_EDGE, total_height - INSET_FROM_EDGE - GROOVE_DEPTH),
-        App.Vector(outer_width/2, INSET_FROM_EDGE, total_height - INSET_FROM_EDGE)
+    grooves = [
+        make_v_prism(v_profile(apex, x_axis, opening, GROOVE_WIDTH, GROOVE_DEPTH), extrusion)
+        for apex, opening, extrusion in segments
     ]
 
-    v_wire_top_front = Part.makePolygon(v_points_top)
-    v_face_top_front = Part.Face(v_wire_top_front)
-    groove_top_front = v_face_top_front.extrude(App.Vector(0, outer_height - 2*INSET_FROM_EDGE, 0))
-    grooves.append(groove_top_front)
-
-    # === GROOVE ON BOTTOM EDGE (Z = 0) ===
-    v_points_bottom = [
-        App.Vector(outer_width/2, INSET_FROM_EDGE, INSET_FROM_EDGE),
-        App.Vector(outer_width/2 - GROOVE_WIDTH, INSET_FROM_EDGE, INSET_FROM_EDGE + GROOVE_DEPTH),
-        App.Vector(outer_width/2 + GROOVE_WIDTH, INSET_FROM_EDGE, INSET_FROM_EDGE + GROOVE_DEPTH),
-        App.Vector(outer_width/2, INSET_FROM_EDGE, INSET_FROM_EDGE)
-    ]
-
-    v_wire_bottom_front = Part.makePolygon(v_points_bottom)
-    v_face_bottom_front = Part.Face(v_wire_bottom_front)
-    groove_bottom_front = v_face_bottom_front.extrude(App.Vector(0, outer_height - 2*INSET_FROM_EDGE, 0))
-    grooves.append(groove_bottom_front)
-
-    # Fuse all grooves
-    if grooves:
-        all_grooves = grooves[0]
-        for groove in grooves[1:]:
-            all_grooves = all_grooves.fuse(groove)
-        return all_grooves
-
-    return None
+    # No pairwise fuse: the grooves cross each other at the corners, so they are
+    # returned as a tool list and subtracted in one boolean by the caller
+    return grooves
 
 
 def cut_frame_in_half(doc, complete_frame):
     """Cuts the frame in two halves and adds welding grooves"""
 
-    cavity_width = TABLET_WIDTH + 2 * CLEARANCE
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-    outer_width = cavity_width + 2 * SHELL_THICKNESS
-    outer_height = cavity_height + 2 * SHELL_THICKNESS
-
-    TABLET_SPACE = 15.0  # mm
-    LIP_VERTICAL = 3.0   # mm
-    total_height = SHELL_THICKNESS + TABLET_SPACE + LIP_VERTICAL
-
     # Left half
-    left_cutter = Part.makeBox(outer_width/2, outer_height, total_height)
-    left_shape = complete_frame.Shape.common(left_cutter)
+    left_cutter = Part.makeBox(OUTER_WIDTH/2, OUTER_HEIGHT, TOTAL_HEIGHT)
+    # List form: FreeCAD only enables OCCT parallel mode for multi-shape booleans
+    left_shape = complete_frame.Shape.common([left_cutter])
 
     # Right half
     right_cutter = Part.makeBox(
-        outer_width/2,
-        outer_height,
-        total_height,
-        App.Vector(outer_width/2, 0, 0)
+        OUTER_WIDTH/2,
+        OUTER_HEIGHT,
+        TOTAL_HEIGHT,
+        App.Vector(OUTER_WIDTH/2, 0, 0)
     )
-    right_shape = complete_frame.Shape.common(right_cutter)
+    right_shape = complete_frame.Shape.common([right_cutter])
 
     # Create welding grooves (disabled for now)
-    # print("\nAdding PLA pen welding grooves...")
-    # welding_groove = create_welding_groove(doc, outer_width, outer_height, total_height)
+    # log("\nAdding PLA pen welding grooves...")
+    # welding_groove = create_welding_groove(doc, OUTER_WIDTH, OUTER_HEIGHT, TOTAL_HEIGHT)
     #
     # if welding_groove:
     #     # Subtract groove from each half
-    #     left_shape = left_shape.cut(welding_groove)
-    #     right_shape = right_shape.cut(welding_groove)
+    #     left_shape = boolean_cut(left_shape, welding_groove)
+    #     right_shape = boolean_cut(right_shape, welding_groove)
 
     left_shell = doc.addObject("Part::Feature", "Left_Half")
     left_shell.Shape = left_shape
+    left_shell.purgeTouched()
 
     right_shell = doc.addObject("Part::Feature", "Right_Half")
     right_shell.Shape = right_shape
+    right_shell.purgeTouched()
 
     return left_shell, right_shell
 
@@ -542,106 +716,109 @@ def cut_frame_in_half(doc, complete_frame):
 def main():
     """Main function"""
 
-    doc = App.newDocument("Z13_Proto")
-
-    print("=== QUICK PROTOTYPE - DIMENSION TEST ===\n")
-
-    print("Creating complete frame...")
-    complete_frame = create_frame_shell(doc)
-
-    print("Cutting into two halves...")
-    left_half, right_half = cut_frame_in_half(doc, complete_frame)
-
-    print("Adding port cutouts...")
-    # Add cutouts on the left part
-    left_cutouts = create_all_cutouts_left(doc)
-
-    # Add ventilation cutouts (common to both halves)
-    vent_cutouts = create_ventilation_cutouts_top(doc)
-    left_cutouts.extend(vent_cutouts)
-
-    if left_cutouts:
-        all_left_cuts = left_cutouts[0]
-        for cutout in left_cutouts[1:]:
-            all_left_cuts = all_left_cuts.fuse(cutout)
-        left_final_shape = left_half.Shape.cut(all_left_cuts)
-        left_final = doc.addObject("Part::Feature", "Left_Half_Final")
-        left_final.Shape = left_final_shape
-    else:
-        left_final = left_half
-
-    # Right part: also add ventilation
-    right_cutouts = create_all_cutouts_right(doc)
-    right_cutouts.extend(vent_cutouts)
-
-    if right_cutouts:
-        all_right_cuts = right_cutouts[0]
-        for cutout in right_cutouts[1:]:
-            all_right_cuts = all_right_cuts.fuse(cutout)
-        right_final_shape = right_half.Shape.cut(all_right_cuts)
-        right_final = doc.addObject("Part::Feature", "Right_Half_Final")
-        right_final.Shape = right_final_shape
-    else:
-        right_final = right_half
-
-    # Hide complete frame and base halves
-    complete_frame.ViewObject.Visibility = False
-    left_half.ViewObject.Visibility = False
-    right_half.ViewObject.Visibility = False
-
-    # Space the two halves for visualization
-    right_final.Placement = App.Placement(
-        App.Vector((TABLET_WIDTH + 2*CLEARANCE + 2*SHELL_THICKNESS)/2 + 10, 0, 0),
-        App.Rotation(App.Vector(0,0,1), 0)
-    )
+    try:
+        doc = App.newDocument("Z13_Proto")
+
+        log("=== QUICK PROTOTYPE - DIMENSION TEST ===\n")
+
+        log("Creating complete frame...")
+        complete_frame = create_frame_shell(doc)
+
+        log("Cutting into two halves...")
+        left_half, right_half = cut_frame_in_half(doc, complete_frame)
+
+        log("Adding port cutouts...")
+        # Add cutouts on the left part
+        left_cutouts = create_all_cutouts_left(doc)
+
+        # Add ventilation cutouts (each half only gets its own holes)
+        left_vents, right_vents = create_ventilation_cutouts_top(doc)
+        left_cutouts.extend(left_vents)
+
+        # All cutouts go to OCCT as the tool group of a single cut instead of
+        # being fused pairwise first (tools may overlap, e.g. kickstand and port 2)
+        if left_cutouts:
+            left_final_shape = boolean_cut(left_half.Shape, left_cutouts)
+            left_final = doc.addObject("Part::Feature", "Left_Half_Final")
+            left_final.Shape = left_final_shape
+            left_final.purgeTouched()
+        else:
+            left_final = left_half
+
+        # Right part: also add ventilation
+        right_cutouts = create_all_cutouts_right(doc)
+        right_cutouts.extend(right_vents)
+
+        if right_cutouts:
+            right_final_shape = boolean_cut(right_half.Shape, right_cutouts)
+            right_final = doc.addObject("Part::Feature", "Right_Half_Final")
+            right_final.Shape = right_final_shape
+            right_final.purgeTouched()
+        else:
+            right_final = right_half
+
+        # Hide complete frame and base halves
+        complete_frame.ViewObject.Visibility = False
+        left_half.ViewObject.Visibility = False
+        right_half.ViewObject.Visibility = False
+
+        # Space the two halves for visualization
+        right_final.Placement = App.Placement(
+            App.Vector(OUTER_WIDTH/2 + 10, 0, 0),
+            App.Rotation(App.Vector(0,0,1), 0)
+        )
 
-    doc.recompute()
-
-    cavity_width = TABLET_WIDTH + 2 * CLEARANCE
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-
-    print("\n=== SHELL v1.2.6 - CUTOUT AND LIP ADJUSTMENTS ===")
-    print(f"\nU-profile structure (cross-section view):")
-    print(f"")
-    print(f"  |----3mm----|  <- 18-21mm: Lip (extends 3mm inward)")
-    print(f"  |           |")
-    print(f"  |           |  <- 3-18mm: WIDE cavity (15mm high)")
-    print(f"  |           |            The 15mm tablet fits here")
-    print(f"  |___________|  <- 0-3mm: 3MM bottom (rigid!)")
-    print(f"")
-    print(f"Total height: 21mm (3mm bottom + 15mm tablet + 3mm lip)")
-    print(f"Outer dimensions: 307 x 211 x 21mm")
-    print(f"\nv1.2.6 Features:")
-    print(f"- Left side port cutouts: 2.3-9.7cm + 14.5-16.5cm")
-    print(f"- Right side port cutouts: 2-9.2cm + 13.8-17.5cm")
-    print(f"- Screen lip: 6mm (reinforced hold)")
-    print(f"- Kickstand notches (x2): 8mm wide, AFTER lips - FIXED!")
-    print(f"- Left position: x=3mm (after left lip)")
-    print(f"- Right position: x=outer_width-11mm (before right lip)")
-    print(f"- FINAL SOLUTION: Notches in inner cavity, not on edge!")
-    print(f"- Circular ventilation: 6mm diameter, 8mm spacing (BOTH sides)")
-    print(f"- Solid bottom: 4cm top + 4cm bottom + side lips INTACT")
-    print(f"- Webcam hole (left): 6mm radius, 1.8cm from top, 1.8cm from side")
-    print(f"- Outer corner fillets: 5mm")
-    print(f"- Outer edge fillets: 1.5mm (very light)")
-    print(f"- Inner fillets: 5mm")
-    print(f"- PLA welding groove (1.5mm x 1.8mm V-shape)")
-    print(f"\nVersion history:")
-    print(f"v1.0.0: Dimensions and cutouts validated")
-    print(f"v1.1.0: 3mm bottom -> +50% rigidity")
-    print(f"v1.1.1: Rounded outer edges -> smooth finish")
-    print(f"v1.1.2: Connector adjustments (power -5mm, audio -10mm)")
-    print(f"v1.2.0: PLA welding groove -> solid pen welding assembly!")
-    print(f"v1.2.1: Circular ventilation 6mm -> more aesthetic and efficient")
-    print(f"v1.2.5: Kickstand notches repositioned INSIDE cavity -> lips intact!")
-    print(f"v1.2.6: Fine adjustments - cutouts +2mm, webcam repositioned, lip +3mm")
-    print(f"\nAssembly:")
-    print(f"1. Assemble the two halves around the tablet")
-    print(f"2. Weld with a PLA pen along the V-groove")
-    print(f"3. The groove guides the melted plastic for a clean and solid weld")
-    print(f"\nVersion v1.2.6 ready!")
-
-    return doc
+        # Single recompute at the very end: every Part::Feature was untouched right
+        # after its Shape was assigned, so only the moved right half is revisited.
+        # Do not add intermediate recomputes. force=True is not needed either: it
+        # only bypasses the skip-recompute guard, touched objects are the only ones
+        # recomputed in both cases.
+        doc.recompute()
+
+        log("\n=== SHELL v1.2.6 - CUTOUT AND LIP ADJUSTMENTS ===")
+        log(f"\nU-profile structure (cross-section view):")
+        log(f"")
+        log(f"  |----3mm----|  <- 18-21mm: Lip (extends 3mm inward)")
+        log(f"  |           |")
+        log(f"  |           |  <- 3-18mm: WIDE cavity (15mm high)")
+        log(f"  |           |            The 15mm tablet fits here")
+        log(f"  |___________|  <- 0-3mm: 3MM bottom (rigid!)")
+        log(f"")
+        log(f"Total height: 21mm (3mm bottom + 15mm tablet + 3mm lip)")
+        log(f"Outer dimensions: 307 x 211 x 21mm")
+        log(f"\nv1.2.6 Features:")
+        log(f"- Left side port cutouts: 2.3-9.7cm + 14.5-16.5cm")
+        log(f"- Right side port cutouts: 2-9.2cm + 13.8-17.5cm")
+        log(f"- Screen lip: 6mm (reinforced hold)")
+        log(f"- Kickstand notches (x2): 8mm wide, AFTER lips - FIXED!")
+        log(f"- Left position: x=3mm (after left lip)")
+        log(f"- Right position: x=outer_width-11mm (before right lip)")
+        log(f"- FINAL SOLUTION: Notches in inner cavity, not on edge!")
+        log(f"- Circular ventilation: 6mm diameter, 8mm spacing (BOTH sides)")
+        log(f"- Solid bottom: 4cm top + 4cm bottom + side lips INTACT")
+        log(f"- Webcam hole (left): 6mm radius, 1.8cm from top, 1.8cm from side")
+        log(f"- Outer corner fillets: 5mm")
+        log(f"- Outer edge fillets: 1.5mm (very light)")
+        log(f"- Inner fillets: 5mm")
+        log(f"- PLA welding groove (1.5mm x 1.8mm V-shape)")
+        log(f"\nVersion history:")
+        log(f"v1.0.0: Dimensions and cutouts validated")
+        log(f"v1.1.0: 3mm bottom -> +50% rigidity")
+        log(f"v1.1.1: Rounded outer edges -> smooth finish")
+        log(f"v1.1.2: Connector adjustments (power -5mm, audio -10mm)")
+        log(f"v1.2.0: PLA welding groove -> solid pen welding assembly!")
+        log(f"v1.2.1: Circular ventilation 6mm -> more aesthetic and efficient")
+        log(f"v1.2.5: Kickstand notches repositioned INSIDE cavity -> lips intact!")
+        log(f"v1.2.6: Fine adjustments - cutouts +2mm, webcam repositioned, lip +3mm")
+        log(f"\nAssembly:")
+        log(f"1. Assemble the two halves around the tablet")
+        log(f"2. Weld with a PLA pen along the V-groove")
+        log(f"3. The groove guides the melted plastic for a clean and solid weld")
+        log(f"\nVersion v1.2.6 ready!")
+
+        return doc
+    finally:
+        flush_log()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Mesh backend for the Asus ROG Flow Z13 2025 back shell
+Same geometry as Asus_FreeCad_macro.py, built with manifold3d booleans and
+exported to STL with trimesh - no FreeCAD needed.
+
+The shell is only made of boxes and cylinders, so mesh booleans are much
+faster than OCCT BRep booleans here. Fillets are NOT applied: use the FreeCAD
+macro when rounded edges or CAD-grade (STEP/BRep) output are needed.
+
+Requirements: pip install manifold3d trimesh numpy
+Usage: python3 Asus_manifold_export.py [-o OUTPUT_DIR]
+"""
+
+import argparse
+import ast
+import os
+from dataclasses import dataclass
+
+import trimesh
+from manifold3d import Manifold, OpType
+
+# Segments used to approximate circles (webcam and ventilation holes)
+CIRCULAR_SEGMENTS = 64
+
+
+# The FreeCAD macro holds every shell parameter: they are read from its source
+MACRO_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Asus_FreeCad_macro.py")
+
+
+def read_macro_constants(path=MACRO_FILE):
+    """Reads the literal constants of the FreeCAD macro, without importing FreeCAD
+
+    Returns {scope: {name: value}}, scope being "" for the module level
+    constants and the function name for the constants local to a function.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    scopes = {"": tree.body}
+    scopes.update((node.name, node.body) for node in tree.body if isinstance(node, ast.FunctionDef))
+
+    constants = {}
+    for scope, body in scopes.items():
+        values = constants.setdefault(scope, {})
+        for node in body:
+            if not (isinstance(node, ast.Assign) and len(node.targets) == 1
+                    and isinstance(node.targets[0], ast.Name)):
+                continue
+            try:
+                values[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:  # computed value (derived dimensions, shapes...)
+                continue
+
+    return constants
+
+
+@dataclass(frozen=True)
+class ShellParams:
+    """Shell parameters (all in mm), read from Asus_FreeCad_macro.py by from_macro()"""
+
+    # Tablet parameters (exact Z13 2025 dimensions)
+    tablet_width: float
+    tablet_height: float
+
+    # Shell parameters
+    shell_thickness: float
+    clearance: float
+
+    # Heights for U-profile
+    tablet_space: float
+    lip_vertical: float
+    lip_overhang: float         # sides and top
+    lip_overhang_bottom: float  # bottom
+
+    # Bottom hole (keep 4cm of solid material at top and bottom)
+    bottom_margin: float
+    solid_top_area: float
+    solid_bottom_area: float
+
+    # Rear webcam (top left)
+    webcam_from_top: float
+    webcam_from_side: float
+    webcam_radius: float
+
+    # Port cutouts (start from top, length)
+    port_cut_width: float
+    left_ports: tuple
+    right_ports: tuple
+
+    # Kickstand notches
+    kickstand_start: float
+    kickstand_end: float
+    kickstand_width: float
+
+    # Ventilation holes on the upper short edge
+    vent_start_from_edge: float
+    vent_end_from_edge: float
+    vent_hole_radius: float
+    vent_hole_spacing: float
+    vent_wall_thickness: float
+
+    @classmethod
+    def from_macro(cls, path=MACRO_FILE):
+        """Reads the parameters from the FreeCAD macro source
+
+        The macro is the only copy of the parameters, so both backends always
+        build the same shell. Raises KeyError when a constant was renamed there.
+        """
+        constants = read_macro_constants(path)
+        shell = constants[""]
+        left = constants["create_all_cutouts_left"]
+        right = constants["create_all_cutouts_right"]
+        vents = constants["create_ventilation_cutouts_top"]
+
+        return cls(
+            tablet_width=shell["TABLET_WIDTH"],
+            tablet_height=shell["TABLET_HEIGHT"],
+            shell_thickness=shell["SHELL_THICKNESS"],
+            clearance=shell["CLEARANCE"],
+            tablet_space=shell["TABLET_SPACE"],
+            lip_vertical=shell["LIP_VERTICAL"],
+            lip_overhang=shell["LIP_OVERHANG"],
+            lip_overhang_bottom=shell["LIP_OVERHANG_BOTTOM"],
+            bottom_margin=shell["BOTTOM_MARGIN"],
+            solid_top_area=shell["SOLID_TOP_AREA"],
+            solid_bottom_area=shell["SOLID_BOTTOM_AREA"],
+            webcam_from_top=shell["WEBCAM_FROM_TOP"],
+            webcam_from_side=shell["WEBCAM_FROM_SIDE"],
+            webcam_radius=shell["WEBCAM_RADIUS"],
+            port_cut_width=left["port_cut_width"],
+            left_ports=(
+                (left["PORT_START_FROM_TOP"], left["PORT_CUT_LENGTH"]),
+                (left["PORT2_START_FROM_TOP"], left["PORT2_CUT_LENGTH"]),
+            ),
+            right_ports=(
+                (right["PORT_START_FROM_TOP"], right["PORT_CUT_LENGTH"]),
+                (right["PORT2_START_FROM_TOP"], right["PORT2_CUT_LENGTH"]),
+            ),
+            kickstand_start=left["KICKSTAND_START"],
+            kickstand_end=left["KICKSTAND_END"],
+            kickstand_width=left["kickstand_width"],
+            vent_start_from_edge=vents["VENT_START_FROM_EDGE"],
+            vent_end_from_edge=vents["VENT_END_FROM_EDGE"],
+            vent_hole_radius=vents["HOLE_RADIUS"],
+            vent_hole_spacing=vents["HOLE_SPACING"],
+            vent_wall_thickness=vents["wall_thickness"],
+        )
+
+    @property
+    def cavity_width(self):
+        return self.tablet_width + 2 * self.clearance
+
+    @property
+    def cavity_height(self):
+        return self.tablet_height + 2 * self.clearance
+
+    @property
+    def outer_width(self):
+        return self.cavity_width + 2 * self.shell_thickness
+
+    @property
+    def outer_height(self):
+        return self.cavity_height + 2 * self.shell_thickness
+
+    @property
+    def total_height(self):
+        return self.shell_thickness + self.tablet_space + self.lip_vertical
+
+
+def box(size_x, size_y, size_z, x=0.0, y=0.0, z=0.0):
+    """Axis-aligned box with its minimum corner at (x, y, z)"""
+    return Manifold.cube((size_x, size_y, size_z)).translate((x, y, z))
+
+
+def cylinder_z(radius, height, x, y, z):
+    """Cylinder along +Z with its base center at (x, y, z)"""
+    return Manifold.cylinder(height, radius, circular_segments=CIRCULAR_SEGMENTS).translate((x, y, z))
+
+
+def cylinder_y(radius, length, x, y, z):
+    """Cylinder along +Y with its base center at (x, y, z)"""
+    return (Manifold.cylinder(length, radius, circular_segments=CIRCULAR_SEGMENTS)
+            .rotate((-90.0, 0.0, 0.0))
+            .translate((x, y, z)))
+
+
+def subtract(shape, tools):
+    """Subtracts all tools from shape in a single batched boolean"""
+    if not tools:
+        return shape
+    return Manifold.batch_boolean([shape] + list(tools), OpType.Subtract)
+
+
+def create_frame_shell(p):
+    """Creates the U-profile frame (no fillets)"""
+    s = p.shell_thickness
+
+    lower_cavity = box(p.cavity_width, p.cavity_height, p.tablet_space + 0.1, s, s, s)
+
+    upper_cavity = box(
+        p.cavity_width - 2 * p.lip_overhang,
+        p.cavity_height - p.lip_overhang - p.lip_overhang_bottom,
+        p.lip_vertical + 0.1,
+        s + p.lip_overhang, s + p.lip_overhang_bottom, s + p.tablet_space,
+    )
+
+    bottom_hole = box(
+        p.cavity_width - 2 * p.bottom_margin,
+        p.cavity_height - 2 * p.bottom_margin - p.solid_top_area - p.solid_bottom_area,
+        s + 0.1,
+        s + p.bottom_margin, s + p.bottom_margin + p.solid_bottom_area, -0.05,
+    )
+
+    webcam_hole = cylinder_z(
+        p.webcam_radius, s + 1,
+        s + p.webcam_from_side, p.outer_height - s - p.webcam_from_top, -0.5,
+    )
+
+    outer_box = box(p.outer_width, p.outer_height, p.total_height)
+    return subtract(outer_box, [lower_cavity, upper_cavity, bottom_hole, webcam_hole])
+
+
+def create_port_cutouts(p, ports, x):
+    """Creates the port cutouts of one long edge, starting at x"""
+    s = p.shell_thickness
+    return [
+        box(p.port_cut_width, length, p.tablet_space + 1,
+            x, p.cavity_height + s - from_top - length, s)
+        for from_top, length in ports
+    ]
+
+
+def create_kickstand_cutout(p, x):
+    """Creates the kickstand notch in the bottom, starting at x"""
+    s = p.shell_thickness
+    return box(
+        p.kickstand_width, p.kickstand_end - p.kickstand_start, s + 1,
+        x, p.cavity_height + s - p.kickstand_end, -0.5,
+    )
+
+
+def create_ventilation_cutouts_top(p):
+    """Creates the ventilation holes, split by half: (left_vents, right_vents)"""
+    s = p.shell_thickness
+    r = p.vent_hole_radius
+    y = p.outer_height - p.vent_wall_thickness - 0.5
+    z = s + p.tablet_space / 2
+
+    xs = []
+    x = p.vent_start_from_edge + s + r
+    while x + r < p.vent_end_from_edge + s:
+        xs.append(x)
+        x += p.vent_hole_spacing
+    x = p.outer_width - p.vent_end_from_edge - s - r
+    while x + r < p.outer_width - p.vent_start_from_edge - s:
+        xs.append(x)
+        x += p.vent_hole_spacing
+
+    middle = p.outer_width / 2
+    left_vents = [cylinder_y(r, p.vent_wall_thickness + 1, x, y, z) for x in xs if x - r < middle]
+    right_vents = [cylinder_y(r, p.vent_wall_thickness + 1, x, y, z) for x in xs if x + r > middle]
+    return left_vents, right_vents
+
+
+def build_with_manifold3d(p):
+    """Builds both halves with manifold3d, returns (left, right) manifolds"""
+    frame = create_frame_shell(p)
+
+    middle = p.outer_width / 2
+    left_half = frame ^ box(middle, p.outer_height, p.total_height)
+    right_half = frame ^ box(middle, p.outer_height, p.total_height, middle)
+
+    left_vents, right_vents = create_ventilation_cutouts_top(p)
+
+    left_cutouts = create_port_cutouts(p, p.left_ports, -1.0)
+    left_cutouts.append(create_kickstand_cutout(p, p.shell_thickness))
+    left_cutouts.extend(left_vents)
+
+    right_cutouts = create_port_cutouts(p, p.right_ports, p.outer_width - p.port_cut_width + 1)
+    right_cutouts.append(create_kickstand_cutout(p, p.outer_width - p.shell_thickness - p.kickstand_width))
+    right_cutouts.extend(right_vents)
+
+    return subtract(left_half, left_cutouts), subtract(right_half, right_cutouts)
+
+
+def export_stl(shape, path):
+    """Exports a manifold to STL through trimesh"""
+    mesh = shape.to_mesh()
+    trimesh.Trimesh(
+        vertices=mesh.vert_properties[:, :3],
+        faces=mesh.tri_verts,
+        process=False,
+    ).export(path)
+    print(f"  -> {path}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Export the Z13 back shell halves to STL with manifold3d")
+    parser.add_argument("-o", "--output-dir", default=".", help="directory for the STL files")
+    args = parser.parse_args()
+
+    params = ShellParams.from_macro()
+    print("=== Z13 SHELL - MANIFOLD3D MESH BACKEND ===")
+    print(f"Outer dimensions: {params.outer_width} x {params.outer_height} x {params.total_height} mm")
+
+    left, right = build_with_manifold3d(params)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    export_stl(left, os.path.join(args.output_dir, "Left_Half_Final.stl"))
+    export_stl(right, os.path.join(args.output_dir, "Right_Half_Final.stl"))
+
+
+if __name__ == "__main__":
+    main()
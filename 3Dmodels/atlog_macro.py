@@ -4,8 +4,15 @@ FreeCAD script for Asus ROG Flow Z13 2025 back shell
 WITH engraved "ATLOG" text on the back exterior (left half, top area)
 """
 
+import hashlib
+import inspect
+import os
+import re
+import tempfile
+
 import FreeCAD as App
 import Part
+import numpy as np
 
 # Tablet parameters (exact Z13 2025 dimensions)
 TABLET_WIDTH = 300.0  # mm
@@ -17,8 +24,26 @@ SHELL_THICKNESS = 3.0  # mm - wall thickness (v1.1.0: increased for rigidity)
 CLEARANCE = 0.5  # mm - gap between tablet and shell
 LIP_HEIGHT = 8.0  # mm - lip height
 
-# Inner fillets
+# Heights for U-profile
+TABLET_SPACE = 15.0  # mm - height for tablet (15mm thickness)
+LIP_VERTICAL = 3.0   # mm - vertical thickness of lip
+
+# Derived dimensions (computed once, shared by every function)
+CAVITY_WIDTH = TABLET_WIDTH + 2 * CLEARANCE  # Inner cavity = tablet size + clearance
+CAVITY_HEIGHT = TABLET_HEIGHT + 2 * CLEARANCE
+OUTER_WIDTH = CAVITY_WIDTH + 2 * SHELL_THICKNESS  # Outer box = cavity + wall thickness
+OUTER_HEIGHT = CAVITY_HEIGHT + 2 * SHELL_THICKNESS
+TOTAL_HEIGHT = SHELL_THICKNESS + TABLET_SPACE + LIP_VERTICAL
+
+# Fuzzy value of the OCCT booleans: the shell is made of millimetre-sized,
+# mostly axis-aligned features, 0.1um is far below print resolution and spares
+# OCCT the refinement of near-coincident intersections
+BOOLEAN_FUZZY_VALUE = 1e-4  # mm
+
+# Fillets
 INNER_CORNER_RADIUS = 5.0  # mm
+OUTER_CORNER_RADIUS = 5.0  # mm
+OUTER_EDGE_RADIUS = 1.5  # mm - very light for horizontal edges
 
 # Text engraving parameters
 TEXT_FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
@@ -36,53 +61,181 @@ TEXT2_SIZE = 15.0    # mm - same as ATLOG
 TEXT2_X_OFFSET = 35.0  # mm - from left edge (aligned with ATLOG)
 TEXT2_Y_OFFSET = 35.0  # mm - from top edge (15 + 15mm ATLOG + 5mm gap)
 
+# Directory of the BREP caches (engraved texts and halves before engraving)
+CACHE_DIR = tempfile.gettempdir()
 
-def create_frame_shell(doc):
-    """Creates a simple frame with U-profile - wide cavity for 15mm tablet, lip on top"""
+# Headless runs (freecadcmd) export the two halves here instead of recomputing
+STEP_EXPORT_FILE = "Z13_atlog_shell.step"
+
+
+def edge_endpoints(candidate_edges):
+    """Returns the edges having two vertexes with their endpoints as an (N, 2, 3) array"""
+    edges = []
+    points = []
+    for edge in candidate_edges:
+        vertexes = edge.Vertexes
+        if len(vertexes) < 2:
+            continue
+        p1 = vertexes[0].Point
+        p2 = vertexes[1].Point
+        edges.append(edge)
+        points.append(((p1.x, p1.y, p1.z), (p2.x, p2.y, p2.z)))
+
+    return edges, np.array(points, dtype=np.float64).reshape(-1, 2, 3)
+
+
+def near_any(points_xy, targets, tol=0.1):
+    """Mask of the (x, y) points lying within tol of any of the target (x, y) pairs"""
+    diff = np.abs(points_xy[:, None, :] - targets[None, :, :])
+    return np.any(np.all(diff < tol, axis=2), axis=1)
+
+
+def corner_edges(shape, corners, tol=0.1):
+    """Returns the edges incident to the vertexes lying at one of the corner (x, y) positions
+
+    The vertexes are matched by coordinate in one NumPy pass, then their edges
+    are fetched from OCCT's vertex -> edge ancestor map instead of walking
+    every edge of the shape.
+    """
+    vertexes = shape.Vertexes
+    points_xy = np.array([(v.X, v.Y) for v in vertexes], dtype=np.float64).reshape(-1, 2)
+
+    edges = {}
+    for i in np.flatnonzero(near_any(points_xy, corners, tol)):
+        for edge in shape.ancestorsOfType(vertexes[i], Part.Edge):
+            edges.setdefault(edge.hashCode(), edge)  # each vertical edge has two corner vertexes
+    return list(edges.values())
+
+
+def make_rect_wire(rect, z):
+    """Creates a closed horizontal rectangular wire from an (x_min, y_min, x_max, y_max) footprint"""
+    x0, y0, x1, y1 = rect
+    return Part.makePolygon([
+        App.Vector(x0, y0, z),
+        App.Vector(x1, y0, z),
+        App.Vector(x1, y1, z),
+        App.Vector(x0, y1, z),
+        App.Vector(x0, y0, z),
+    ])
+
+
+def make_circle_wire(circle, z):
+    """Creates a closed horizontal circular wire from an (x, y, radius) circle"""
+    x, y, radius = circle
+    return Part.Wire(Part.makeCircle(radius, App.Vector(x, y, z), App.Vector(0, 0, 1)))
+
+
+def make_ring_face(outer_rect, hole_rect, z, hole_circles=()):
+    """Creates a horizontal rectangular face with one rectangular hole and optional round holes"""
+    wires = [make_rect_wire(outer_rect, z), make_rect_wire(hole_rect, z)]
+    wires += [make_circle_wire(circle, z) for circle in hole_circles]
+    return Part.makeFace(wires, "Part::FaceMakerBullseye")
+
+
+def make_side_faces(rect, z_min, z_max):
+    """Creates the four vertical faces standing on the sides of a footprint"""
+    x0, y0, x1, y1 = rect
+    corners = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+    faces = []
+    for (ax, ay), (bx, by) in zip(corners, corners[1:] + corners[:1]):
+        faces.append(Part.Face(Part.makePolygon([
+            App.Vector(ax, ay, z_min),
+            App.Vector(bx, by, z_min),
+            App.Vector(bx, by, z_max),
+            App.Vector(ax, ay, z_max),
+            App.Vector(ax, ay, z_min),
+        ])))
+    return faces
+
+
+def rect_area(rect):
+    """Area of an (x_min, y_min, x_max, y_max) footprint"""
+    return (rect[2] - rect[0]) * (rect[3] - rect[1])
+
+
+def build_u_profile_shell(outer_rect, cavity_rect, lip_rect, hole_rect, floor_z, lip_z, top_z, floor_circles=()):
+    """Builds the U-profile solid from its faces, without any boolean
+
+    outer_rect is the outer box footprint, cavity_rect the wide cavity from
+    floor_z to lip_z, lip_rect the narrow opening from lip_z to top_z and
+    hole_rect the hole through the floor. floor_circles are extra round holes
+    through the floor as (x, y, radius): each one is a circular inner wire in
+    both floor faces plus one cylindrical wall. The faces are sewn into a
+    closed shell; returns None when the resulting solid is not valid, so that
+    the caller can fall back to booleans.
+    """
+    faces = [
+        make_ring_face(outer_rect, hole_rect, 0.0, floor_circles),       # Bottom
+        make_ring_face(outer_rect, lip_rect, top_z),                     # Top of the lip
+        make_ring_face(cavity_rect, hole_rect, floor_z, floor_circles),  # Cavity floor
+        make_ring_face(cavity_rect, lip_rect, lip_z),                    # Underside of the lip
+    ]
+    faces += make_side_faces(outer_rect, 0.0, top_z)      # Outer walls
+    faces += make_side_faces(cavity_rect, floor_z, lip_z)  # Cavity walls
+    faces += make_side_faces(lip_rect, lip_z, top_z)      # Lip opening
+    faces += make_side_faces(hole_rect, 0.0, floor_z)     # Bottom hole
+
+    for x, y, radius in floor_circles:
+        cylinder = Part.makeCylinder(radius, floor_z, App.Vector(x, y, 0), App.Vector(0, 0, 1))
+        faces += [face for face in cylinder.Faces if isinstance(face.Surface, Part.Cylinder)]
+
+    expected_volume = (
+        rect_area(outer_rect) * top_z
+        - rect_area(hole_rect) * floor_z
+        - rect_area(cavity_rect) * (lip_z - floor_z)
+        - rect_area(lip_rect) * (top_z - lip_z)
+        - sum(np.pi * radius ** 2 for _, _, radius in floor_circles) * floor_z
+    )
+
+    try:
+        sewn = Part.Shell(faces)
+        sewn.sewShape()
+        solid = Part.Solid(Part.Shell(sewn.Faces))
+        if solid.Volume < 0:
+            solid.reverse()
+    except Exception as e:
+        print(f"  Warning: U-profile sewing failed: {e}")
+        return None
+
+    if not solid.isValid() or abs(solid.Volume - expected_volume) > 1e-6 * expected_volume:
+        return None
 
-    # CORRECTED DIMENSIONS
-    # Inner cavity = tablet size + clearance
-    cavity_width = TABLET_WIDTH + 2 * CLEARANCE
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
+    return solid
 
-    # Outer box = cavity + wall thickness
-    outer_width = cavity_width + 2 * SHELL_THICKNESS
-    outer_height = cavity_height + 2 * SHELL_THICKNESS
 
-    # Heights for U-profile
-    TABLET_SPACE = 15.0  # mm - height for tablet (15mm thickness)
+def create_frame_shell(doc):
+    """Creates a simple frame with U-profile - wide cavity for 15mm tablet, lip on top
+
+    Returns (shape, clean) with the raw shape: only the final halves are added
+    to the document. clean is False when the boolean fallback ran or a fillet
+    pass failed.
+    """
+
+    # Lip overhang
     LIP_OVERHANG = 3.0   # mm - horizontal lip on sides and top (original value)
     LIP_OVERHANG_BOTTOM = 9.0  # mm - horizontal lip at bottom (v1.2.6: +6mm)
-    LIP_VERTICAL = 3.0   # mm - vertical thickness of lip
-    total_height = SHELL_THICKNESS + TABLET_SPACE + LIP_VERTICAL
 
-    print(f"Outer box dimensions: {outer_width} x {outer_height} x {total_height} mm")
-    print(f"Cavity dimensions: {cavity_width} x {cavity_height} mm")
+    print(f"Outer box dimensions: {OUTER_WIDTH} x {OUTER_HEIGHT} x {TOTAL_HEIGHT} mm")
+    print(f"Cavity dimensions: {CAVITY_WIDTH} x {CAVITY_HEIGHT} mm")
     print(f"Tablet dimensions: {TABLET_WIDTH} x {TABLET_HEIGHT} x 15 mm")
     print(f"Structure: Bottom {SHELL_THICKNESS}mm + Tablet space {TABLET_SPACE}mm + Lip {LIP_VERTICAL}mm")
 
-    # Outer body
-    outer_box = Part.makeBox(outer_width, outer_height, total_height)
+    # Footprints of the U-profile levels as (x_min, y_min, x_max, y_max)
+    outer_rect = (0.0, 0.0, OUTER_WIDTH, OUTER_HEIGHT)
 
     # WIDE CAVITY at BOTTOM: To accommodate the tablet (15mm high)
-    # From z=SHELL_THICKNESS to z=SHELL_THICKNESS+TABLET_SPACE
-    lower_cavity = Part.makeBox(
-        cavity_width,
-        cavity_height,
-        TABLET_SPACE + 0.1,
-        App.Vector(SHELL_THICKNESS, SHELL_THICKNESS, SHELL_THICKNESS)
-    )
+    # From z=SHELL_THICKNESS to z=SHELL_THICKNESS+TABLET_SPACE+0.1 (0.1mm vertical play)
+    lip_z = SHELL_THICKNESS + TABLET_SPACE + 0.1
+    cavity_rect = (SHELL_THICKNESS, SHELL_THICKNESS, OUTER_WIDTH - SHELL_THICKNESS, OUTER_HEIGHT - SHELL_THICKNESS)
 
     # NARROW CAVITY at TOP: With lip going inward (asymmetric: more at bottom)
-    # From z=SHELL_THICKNESS+TABLET_SPACE to z=total_height
-    upper_cavity_width = cavity_width - 2 * LIP_OVERHANG
-    upper_cavity_height = cavity_height - LIP_OVERHANG - LIP_OVERHANG_BOTTOM  # Asymmetric top/bottom
-    upper_cavity = Part.makeBox(
-        upper_cavity_width,
-        upper_cavity_height,
-        LIP_VERTICAL + 0.1,
-        App.Vector(SHELL_THICKNESS + LIP_OVERHANG, SHELL_THICKNESS + LIP_OVERHANG_BOTTOM, SHELL_THICKNESS + TABLET_SPACE)
-    )
+    # From z=SHELL_THICKNESS+TABLET_SPACE+0.1 to z=TOTAL_HEIGHT
+    upper_cavity_width = CAVITY_WIDTH - 2 * LIP_OVERHANG
+    upper_cavity_height = CAVITY_HEIGHT - LIP_OVERHANG - LIP_OVERHANG_BOTTOM  # Asymmetric top/bottom
+    upper_cavity_x = SHELL_THICKNESS + LIP_OVERHANG
+    upper_cavity_y = SHELL_THICKNESS + LIP_OVERHANG_BOTTOM
+    upper_cavity_rect = (upper_cavity_x, upper_cavity_y,
+                         upper_cavity_x + upper_cavity_width, upper_cavity_y + upper_cavity_height)
 
     # Remove bottom IN THE MIDDLE ONLY (save material)
     # Keep 4cm of solid material at TOP and 4cm at BOTTOM
@@ -91,18 +244,12 @@ def create_frame_shell(doc):
     solid_bottom_area = 40.0  # mm - 4cm of solid bottom at bottom
 
     # The hole starts 4cm after the bottom and stops 4cm before the top
+    bottom_hole_x = SHELL_THICKNESS + bottom_margin
     bottom_hole_y_start = SHELL_THICKNESS + bottom_margin + solid_bottom_area
-    bottom_hole_y_size = cavity_height - 2 * bottom_margin - solid_top_area - solid_bottom_area
-
-    bottom_hole = Part.makeBox(
-        cavity_width - 2 * bottom_margin,
-        bottom_hole_y_size,
-        SHELL_THICKNESS + 0.1,
-        App.Vector(SHELL_THICKNESS + bottom_margin, bottom_hole_y_start, -0.05)
-    )
-
-    # Subtract all cavities
-    shell_shape = outer_box.cut(lower_cavity).cut(upper_cavity).cut(bottom_hole)
+    bottom_hole_width = CAVITY_WIDTH - 2 * bottom_margin
+    bottom_hole_y_size = CAVITY_HEIGHT - 2 * bottom_margin - solid_top_area - solid_bottom_area
+    bottom_hole_rect = (bottom_hole_x, bottom_hole_y_start,
+                        bottom_hole_x + bottom_hole_width, bottom_hole_y_start + bottom_hole_y_size)
 
     # Hole for rear webcam TOP LEFT (in solid area)
     # v1.2.6: Moved down 3mm and closer to edge by 2mm
@@ -112,150 +259,155 @@ def create_frame_shell(doc):
 
     # Left camera position (top left)
     webcam_x = SHELL_THICKNESS + WEBCAM_FROM_SIDE
-    webcam_y = outer_height - SHELL_THICKNESS - WEBCAM_FROM_TOP
-
-    webcam_hole = Part.makeCylinder(
-        WEBCAM_RADIUS,
-        SHELL_THICKNESS + 1,
-        App.Vector(webcam_x, webcam_y, -0.5),
-        App.Vector(0, 0, 1)
+    webcam_y = OUTER_HEIGHT - SHELL_THICKNESS - WEBCAM_FROM_TOP
+
+    # Every face of the U-profile is an axis-aligned rectangle, except the
+    # webcam hole wall: build the solid directly from its faces, the boolean
+    # engine is only the fallback
+    shell_shape = build_u_profile_shell(
+        outer_rect, cavity_rect, upper_cavity_rect, bottom_hole_rect,
+        SHELL_THICKNESS, lip_z, TOTAL_HEIGHT,
+        floor_circles=[(webcam_x, webcam_y, WEBCAM_RADIUS)]
     )
 
-    # Subtract webcam hole
-    shell_shape = shell_shape.cut(webcam_hole)
-
-    # === APPLY FILLETS IN 3 SEPARATE PASSES ===
-
-    # PASS 1: Inner cavity fillets
-    print("Applying inner fillets...")
-    edges_to_fillet_inner = []
-
-    for edge in shell_shape.Edges:
-        if len(edge.Vertexes) < 2:
-            continue
-
-        p1 = edge.Vertexes[0].Point
-        p2 = edge.Vertexes[1].Point
-
-        # Vertical edge
-        if abs(p1.x - p2.x) < 0.001 and abs(p1.y - p2.y) < 0.001:
-            x = p1.x
-            y = p1.y
-            z = p1.z
-
-            # INNER corners of the wide cavity (at bottom)
-            is_inner_corner = (
-                (abs(x - SHELL_THICKNESS) < 0.1 and abs(y - SHELL_THICKNESS) < 0.1) or
-                (abs(x - SHELL_THICKNESS) < 0.1 and abs(y - (outer_height - SHELL_THICKNESS)) < 0.1) or
-                (abs(x - (outer_width - SHELL_THICKNESS)) < 0.1 and abs(y - SHELL_THICKNESS) < 0.1) or
-                (abs(x - (outer_width - SHELL_THICKNESS)) < 0.1 and abs(y - (outer_height - SHELL_THICKNESS)) < 0.1)
-            )
-
-            # Inner edges (lower part only)
-            if is_inner_corner and z > SHELL_THICKNESS - 0.5 and z < SHELL_THICKNESS + TABLET_SPACE + 0.5:
-                edges_to_fillet_inner.append(edge)
-
-    if edges_to_fillet_inner and INNER_CORNER_RADIUS > 0:
-        try:
-            shell_shape = shell_shape.makeFillet(INNER_CORNER_RADIUS, edges_to_fillet_inner)
-            print(f"  -> {len(edges_to_fillet_inner)} inner edges filleted")
-        except Exception as e:
-            print(f"  Warning: Inner fillet error: {e}")
-
-    # PASS 2: Outer vertical fillets (corners)
-    print("Applying outer vertical fillets...")
-    edges_to_fillet_outer_vertical = []
+    clean = shell_shape is not None
+    if shell_shape is None:
+        print("  Warning: analytical U-profile is invalid, falling back to booleans")
 
-    for edge in shell_shape.Edges:
-        if len(edge.Vertexes) < 2:
-            continue
+        webcam_hole = Part.makeCylinder(
+            WEBCAM_RADIUS,
+            SHELL_THICKNESS + 1,
+            App.Vector(webcam_x, webcam_y, -0.5),
+            App.Vector(0, 0, 1)
+        )
 
-        p1 = edge.Vertexes[0].Point
-        p2 = edge.Vertexes[1].Point
+        # Outer body
+        outer_box = Part.makeBox(OUTER_WIDTH, OUTER_HEIGHT, TOTAL_HEIGHT)
 
-        # Vertical edge
-        if abs(p1.x - p2.x) < 0.001 and abs(p1.y - p2.y) < 0.001:
-            x = p1.x
-            y = p1.y
+        lower_cavity = Part.makeBox(
+            CAVITY_WIDTH,
+            CAVITY_HEIGHT,
+            TABLET_SPACE + 0.1,
+            App.Vector(SHELL_THICKNESS, SHELL_THICKNESS, SHELL_THICKNESS)
+        )
 
-            # OUTER corners of the box
-            is_outer_corner = (
-                (abs(x) < 0.1 and abs(y) < 0.1) or
-                (abs(x) < 0.1 and abs(y - outer_height) < 0.1) or
-                (abs(x - outer_width) < 0.1 and abs(y) < 0.1) or
-                (abs(x - outer_width) < 0.1 and abs(y - outer_height) < 0.1)
-            )
+        upper_cavity = Part.makeBox(
+            upper_cavity_width,
+            upper_cavity_height,
+            LIP_VERTICAL + 0.1,
+            App.Vector(upper_cavity_x, upper_cavity_y, SHELL_THICKNESS + TABLET_SPACE)
+        )
 
-            if is_outer_corner:
-                edges_to_fillet_outer_vertical.append(edge)
+        bottom_hole = Part.makeBox(
+            bottom_hole_width,
+            bottom_hole_y_size,
+            SHELL_THICKNESS + 0.1,
+            App.Vector(bottom_hole_x, bottom_hole_y_start, -0.05)
+        )
 
-    OUTER_CORNER_RADIUS = 5.0  # mm
-    if edges_to_fillet_outer_vertical and OUTER_CORNER_RADIUS > 0:
+        # Subtract all cavities and the webcam hole in a single boolean
+        # (the tools slightly overlap each other, so they are passed as a list, not a compound)
+        shell_shape = outer_box.cut([lower_cavity, upper_cavity, bottom_hole, webcam_hole], BOOLEAN_FUZZY_VALUE)
+        del outer_box, lower_cavity, upper_cavity, bottom_hole, webcam_hole  # not needed by the fillets
+
+    # === APPLY FILLETS ===
+    # Inner and outer vertical edges are classified on the same unfilleted shape
+    # and filleted together when their radii match (one BRep rebuild instead of two)
+
+    # PASS 1: Inner cavity and outer vertical fillets (corners)
+    print("Applying inner and outer vertical fillets...")
+
+    # INNER corners of the wide cavity (at bottom)
+    inner_corners = np.array([
+        (SHELL_THICKNESS, SHELL_THICKNESS),
+        (SHELL_THICKNESS, OUTER_HEIGHT - SHELL_THICKNESS),
+        (OUTER_WIDTH - SHELL_THICKNESS, SHELL_THICKNESS),
+        (OUTER_WIDTH - SHELL_THICKNESS, OUTER_HEIGHT - SHELL_THICKNESS),
+    ])
+    edges, pts = edge_endpoints(corner_edges(shell_shape, inner_corners))
+
+    # Vertical edges (the other edges reaching a corner vertex are horizontal)
+    is_vertical = np.abs(pts[:, 0, :2] - pts[:, 1, :2]).max(axis=1) < 0.001
+
+    # Inner edges (lower part only)
+    z = pts[:, 0, 2]
+    in_lower_part = (z > SHELL_THICKNESS - 0.5) & (z < SHELL_THICKNESS + TABLET_SPACE + 0.5)
+
+    edges_to_fillet_inner = [edges[i] for i in np.flatnonzero(is_vertical & in_lower_part)]
+
+    # OUTER corners of the box
+    outer_corners = np.array([
+        (0.0, 0.0),
+        (0.0, OUTER_HEIGHT),
+        (OUTER_WIDTH, 0.0),
+        (OUTER_WIDTH, OUTER_HEIGHT),
+    ])
+    edges, pts = edge_endpoints(corner_edges(shell_shape, outer_corners))
+
+    # Vertical edges
+    is_vertical = np.abs(pts[:, 0, :2] - pts[:, 1, :2]).max(axis=1) < 0.001
+
+    edges_to_fillet_outer_vertical = [edges[i] for i in np.flatnonzero(is_vertical)]
+
+    # Group edges by radius
+    fillet_groups = {}
+    for radius, group in ((INNER_CORNER_RADIUS, edges_to_fillet_inner),
+                          (OUTER_CORNER_RADIUS, edges_to_fillet_outer_vertical)):
+        if group and radius > 0:
+            fillet_groups.setdefault(radius, []).extend(group)
+
+    for radius, group in fillet_groups.items():
         try:
-            shell_shape = shell_shape.makeFillet(OUTER_CORNER_RADIUS, edges_to_fillet_outer_vertical)
-            print(f"  -> {len(edges_to_fillet_outer_vertical)} outer corners filleted")
+            shell_shape = shell_shape.makeFillet(radius, group)
+            print(f"  -> {len(group)} vertical edges filleted ({radius}mm)")
         except Exception as e:
-            print(f"  Warning: Vertical fillet error: {e}")
+            print(f"  Warning: Vertical fillet error ({radius}mm): {e}")
+            clean = False
 
-    # PASS 3: Outer horizontal fillets (light edges)
+    # PASS 2: Outer horizontal fillets (light edges)
+    # Reclassified on the filleted shape: the corner fillets rebuilt these edges
     print("Applying outer horizontal fillets...")
-    edges_to_fillet_outer_horizontal = []
+    edges, pts = edge_endpoints(shell_shape.Edges)
+
+    # HORIZONTAL outer edges (top and bottom edges)
+    is_horizontal = np.abs(pts[:, 0, 2] - pts[:, 1, 2]) < 0.001
+    z = pts[:, 0, 2]
+    p_min = pts.min(axis=1)
+    p_max = pts.max(axis=1)
+
+    # Outer edges (on outer faces of the box)
+    is_top_or_bottom = (np.abs(z - TOTAL_HEIGHT) < 0.1) | (np.abs(z) < 0.1)
+    is_outer_side = (
+        (np.abs(p_min[:, 0]) < 0.1) | (np.abs(p_max[:, 0] - OUTER_WIDTH) < 0.1) |  # Left or right side
+        (np.abs(p_min[:, 1]) < 0.1) | (np.abs(p_max[:, 1] - OUTER_HEIGHT) < 0.1)    # Front or back side
+    )
 
-    for edge in shell_shape.Edges:
-        if len(edge.Vertexes) < 2:
-            continue
+    edges_to_fillet_outer_horizontal = [
+        edges[i] for i in np.flatnonzero(is_horizontal & is_top_or_bottom & is_outer_side)
+    ]
 
-        p1 = edge.Vertexes[0].Point
-        p2 = edge.Vertexes[1].Point
-
-        # HORIZONTAL outer edges (top and bottom edges)
-        if abs(p1.z - p2.z) < 0.001:
-            z = p1.z
-            x_min = min(p1.x, p2.x)
-            x_max = max(p1.x, p2.x)
-            y_min = min(p1.y, p2.y)
-            y_max = max(p1.y, p2.y)
-
-            # Outer edges (on outer faces of the box)
-            is_outer_edge = (
-                (abs(z - total_height) < 0.1 or abs(z) < 0.1) and  # Top or bottom
-                (
-                    abs(x_min) < 0.1 or abs(x_max - outer_width) < 0.1 or  # Left or right side
-                    abs(y_min) < 0.1 or abs(y_max - outer_height) < 0.1    # Front or back side
-                )
-            )
-
-            if is_outer_edge:
-                edges_to_fillet_outer_horizontal.append(edge)
-
-    OUTER_EDGE_RADIUS = 1.5  # mm - very light for horizontal edges
     if edges_to_fillet_outer_horizontal and OUTER_EDGE_RADIUS > 0:
         try:
             shell_shape = shell_shape.makeFillet(OUTER_EDGE_RADIUS, edges_to_fillet_outer_horizontal)
             print(f"  -> {len(edges_to_fillet_outer_horizontal)} horizontal edges filleted")
         except Exception as e:
             print(f"  Warning: Horizontal fillet error: {e}")
+            clean = False
 
-    shell = doc.addObject("Part::Feature", "Complete_Frame_U_Profile")
-    shell.Shape = shell_shape
-
-    return shell
+    return shell_shape, clean
 
 
 def create_all_cutouts_left(doc):
     """Creates all objects to subtract for the left part"""
     cutouts = []
 
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-
     # Cutout 1: Main ports (USB, HDMI, power) AT TOP
     # v1.2.6: Moved up 2mm and enlarged
     PORT_START_FROM_TOP = 23.0  # mm - 2.3cm from top (was 2.5cm)
     PORT_CUT_LENGTH = 74.0  # mm - 7.4cm length (was 7.2cm)
 
-    port_y_start = cavity_height + SHELL_THICKNESS - PORT_START_FROM_TOP - PORT_CUT_LENGTH
+    port_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - PORT_START_FROM_TOP - PORT_CUT_LENGTH
 
-    TABLET_SPACE = 15.0  # mm
     port_cut_height = TABLET_SPACE + 1  # mm - goes through entire vertical lip
     port_cut_width = 8.0  # mm
 
@@ -271,7 +423,7 @@ def create_all_cutouts_left(doc):
     PORT2_START_FROM_TOP = 145.0  # mm - 14.5cm from top
     PORT2_CUT_LENGTH = 20.0  # mm - 2cm length (16.5 - 14.5)
 
-    port2_y_start = cavity_height + SHELL_THICKNESS - PORT2_START_FROM_TOP - PORT2_CUT_LENGTH
+    port2_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - PORT2_START_FROM_TOP - PORT2_CUT_LENGTH
 
     ports_cutout2 = Part.makeBox(
         port_cut_width,
@@ -289,7 +441,7 @@ def create_all_cutouts_left(doc):
     KICKSTAND_LENGTH = KICKSTAND_END - KICKSTAND_START  # 5.5cm
 
     # Y position (from top to bottom)
-    kickstand_y_start = cavity_height + SHELL_THICKNESS - KICKSTAND_END
+    kickstand_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - KICKSTAND_END
 
     kickstand_width = 10.0  # mm - notch width
 
@@ -310,12 +462,6 @@ def create_all_cutouts_left(doc):
 
 def create_ventilation_cutouts_top(doc):
     """Creates circular holes (6mm diameter) on the upper short edge for ventilation (BOTH SIDES)"""
-    cutouts = []
-
-    cavity_width = TABLET_WIDTH + 2 * CLEARANCE
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-    outer_height = cavity_height + 2 * SHELL_THICKNESS
-    outer_width = cavity_width + 2 * SHELL_THICKNESS
 
     # Ventilation zone: from 1.5cm to 8cm from edge
     VENT_START_FROM_EDGE = 15.0  # mm - 1.5cm from edge
@@ -325,43 +471,37 @@ def create_ventilation_cutouts_top(doc):
     HOLE_RADIUS = 3.0  # mm - radius 3mm = diameter 6mm
     HOLE_SPACING = 8.0  # mm - spacing between holes (reduced for more ventilation)
 
-    TABLET_SPACE = 15.0  # mm
-
     # Upper wall height
     wall_thickness = 8.0  # mm - upper wall thickness
 
     # Z position (middle of lip height)
     hole_z = SHELL_THICKNESS + TABLET_SPACE / 2
 
-    # LEFT SIDE: Create holes from 1.5cm to 8cm from left edge
-    x_position = VENT_START_FROM_EDGE + SHELL_THICKNESS + HOLE_RADIUS
+    # Hole positions are an arithmetic progression on each side: a hole fits
+    # while its right edge stays before the end of the ventilation zone
 
-    while x_position + HOLE_RADIUS < VENT_END_FROM_EDGE + SHELL_THICKNESS:
-        # Horizontal circular hole (cylinder oriented in Y)
-        hole = Part.makeCylinder(
-            HOLE_RADIUS,
-            wall_thickness + 1,
-            App.Vector(x_position, outer_height - wall_thickness - 0.5, hole_z),
-            App.Vector(0, 1, 0)  # Oriented forward
-        )
-        cutouts.append(hole)
-
-        x_position += HOLE_SPACING
+    # LEFT SIDE: holes from 1.5cm to 8cm from left edge
+    left_xs = VENT_START_FROM_EDGE + SHELL_THICKNESS + HOLE_RADIUS + np.arange(
+        0.0, VENT_END_FROM_EDGE - VENT_START_FROM_EDGE - 2 * HOLE_RADIUS, HOLE_SPACING
+    )
 
-    # RIGHT SIDE: Create same holes symmetrically (from 1.5cm to 8cm from right edge)
-    x_position = outer_width - VENT_END_FROM_EDGE - SHELL_THICKNESS - HOLE_RADIUS
+    # RIGHT SIDE: same holes symmetrically (from 1.5cm to 8cm from right edge).
+    # The first hole starts one radius inside the zone, so one more hole fits
+    # than on the left (same bound as the main macro)
+    right_xs = OUTER_WIDTH - VENT_END_FROM_EDGE - SHELL_THICKNESS - HOLE_RADIUS + np.arange(
+        0.0, VENT_END_FROM_EDGE - VENT_START_FROM_EDGE, HOLE_SPACING
+    )
 
-    while x_position + HOLE_RADIUS < outer_width - VENT_START_FROM_EDGE - SHELL_THICKNESS:
-        # Horizontal circular hole (cylinder oriented in Y)
-        hole = Part.makeCylinder(
+    # Horizontal circular holes (cylinders oriented in Y)
+    cutouts = [
+        Part.makeCylinder(
             HOLE_RADIUS,
             wall_thickness + 1,
-            App.Vector(x_position, outer_height - wall_thickness - 0.5, hole_z),
+            App.Vector(float(x), OUTER_HEIGHT - wall_thickness - 0.5, hole_z),
             App.Vector(0, 1, 0)  # Oriented forward
         )
-        cutouts.append(hole)
-
-        x_position += HOLE_SPACING
+        for x in np.concatenate((left_xs, right_xs))
+    ]
 
     return cutouts
 
@@ -370,26 +510,21 @@ def create_all_cutouts_right(doc):
     """Creates all objects to subtract for the right part (mirror of left)"""
     cutouts = []
 
-    cavity_width = TABLET_WIDTH + 2 * CLEARANCE
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-    outer_width = cavity_width + 2 * SHELL_THICKNESS
-
     # Cutout 1: Main ports AT TOP (mirror of left side)
     PORT_START_FROM_TOP = 20.0  # mm - 2.0cm from top
     PORT_CUT_LENGTH = 72.0  # mm - 7.2cm length
 
-    port_y_start = cavity_height + SHELL_THICKNESS - PORT_START_FROM_TOP - PORT_CUT_LENGTH
+    port_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - PORT_START_FROM_TOP - PORT_CUT_LENGTH
 
-    TABLET_SPACE = 15.0  # mm
     port_cut_height = TABLET_SPACE + 1  # mm - goes through entire vertical lip
     port_cut_width = 8.0  # mm
 
-    # Position on RIGHT edge (x = outer_width instead of x = -1)
+    # Position on RIGHT edge (x = OUTER_WIDTH instead of x = -1)
     ports_cutout = Part.makeBox(
         port_cut_width,   # Width (depth into wall)
         PORT_CUT_LENGTH,  # Length along edge
         port_cut_height,  # Height (goes through lip)
-        App.Vector(outer_width - port_cut_width + 1, port_y_start, SHELL_THICKNESS)  # Starts ABOVE bottom
+        App.Vector(OUTER_WIDTH - port_cut_width + 1, port_y_start, SHELL_THICKNESS)  # Starts ABOVE bottom
     )
     cutouts.append(ports_cutout)
 
@@ -397,13 +532,13 @@ def create_all_cutouts_right(doc):
     PORT2_START_FROM_TOP = 138.0  # mm - 13.8cm from top (was 14.0cm)
     PORT2_CUT_LENGTH = 37.0  # mm - 3.7cm length (was 3.5cm)
 
-    port2_y_start = cavity_height + SHELL_THICKNESS - PORT2_START_FROM_TOP - PORT2_CUT_LENGTH
+    port2_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - PORT2_START_FROM_TOP - PORT2_CUT_LENGTH
 
     ports_cutout2 = Part.makeBox(
         port_cut_width,
         PORT2_CUT_LENGTH,
         port_cut_height,
-        App.Vector(outer_width - port_cut_width + 1, port2_y_start, SHELL_THICKNESS)  # Starts ABOVE bottom
+        App.Vector(OUTER_WIDTH - port_cut_width + 1, port2_y_start, SHELL_THICKNESS)  # Starts ABOVE bottom
     )
     cutouts.append(ports_cutout2)
 
@@ -415,7 +550,7 @@ def create_all_cutouts_right(doc):
     KICKSTAND_LENGTH = KICKSTAND_END - KICKSTAND_START  # 5.5cm
 
     # Y position (from top to bottom)
-    kickstand_y_start = cavity_height + SHELL_THICKNESS - KICKSTAND_END
+    kickstand_y_start = CAVITY_HEIGHT + SHELL_THICKNESS - KICKSTAND_END
 
     kickstand_width = 10.0  # mm - notch width
 
@@ -423,7 +558,7 @@ def create_all_cutouts_right(doc):
         kickstand_width,      # Width
         KICKSTAND_LENGTH,     # Length (5.5cm)
         SHELL_THICKNESS + 1,  # Goes through entire bottom
-        App.Vector(outer_width - SHELL_THICKNESS - kickstand_width, kickstand_y_start, -0.5)  # FIXED: ends BEFORE lip
+        App.Vector(OUTER_WIDTH - SHELL_THICKNESS - kickstand_width, kickstand_y_start, -0.5)  # FIXED: ends BEFORE lip
     )
     cutouts.append(kickstand_cutout)
 
@@ -505,78 +640,259 @@ def create_welding_groove(doc, outer_width, outer_height, total_height):
 
 
 def cut_frame_in_half(doc, complete_frame):
-    """Cuts the frame in two halves and adds welding grooves"""
-
-    cavity_width = TABLET_WIDTH + 2 * CLEARANCE
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-    outer_width = cavity_width + 2 * SHELL_THICKNESS
-    outer_height = cavity_height + 2 * SHELL_THICKNESS
-
-    TABLET_SPACE = 15.0  # mm
-    LIP_VERTICAL = 3.0   # mm
-    total_height = SHELL_THICKNESS + TABLET_SPACE + LIP_VERTICAL
+    """Cuts the frame shape in two halves and adds welding grooves, returns the two raw shapes"""
 
     # Left half
-    left_cutter = Part.makeBox(outer_width/2, outer_height, total_height)
-    left_shape = complete_frame.Shape.common(left_cutter)
+    left_cutter = Part.makeBox(OUTER_WIDTH/2, OUTER_HEIGHT, TOTAL_HEIGHT)
 
     # Right half
     right_cutter = Part.makeBox(
-        outer_width/2,
-        outer_height,
-        total_height,
-        App.Vector(outer_width/2, 0, 0)
+        OUTER_WIDTH/2,
+        OUTER_HEIGHT,
+        TOTAL_HEIGHT,
+        App.Vector(OUTER_WIDTH/2, 0, 0)
     )
-    right_shape = complete_frame.Shape.common(right_cutter)
+
+    # Split the frame by both cutters in one General Fuse: the interferences
+    # are computed once for both halves instead of once per common()
+    _, pieces_map = complete_frame.generalFuse([left_cutter, right_cutter], BOOLEAN_FUZZY_VALUE)
+
+    # pieces_map[0] holds the pieces of the frame itself, sorted by side
+    left_pieces = []
+    right_pieces = []
+    for piece in pieces_map[0]:
+        bbox = piece.BoundBox
+        if (bbox.XMin + bbox.XMax) / 2 < OUTER_WIDTH/2:
+            left_pieces.append(piece)
+        else:
+            right_pieces.append(piece)
+
+    left_shape = left_pieces[0] if len(left_pieces) == 1 else Part.Compound(left_pieces)
+    right_shape = right_pieces[0] if len(right_pieces) == 1 else Part.Compound(right_pieces)
 
     # Create welding grooves (disabled for now)
     # print("\nAdding PLA pen welding grooves...")
-    # welding_groove = create_welding_groove(doc, outer_width, outer_height, total_height)
+    # welding_groove = create_welding_groove(doc, OUTER_WIDTH, OUTER_HEIGHT, TOTAL_HEIGHT)
     #
     # if welding_groove:
     #     # Subtract groove from each half
     #     left_shape = left_shape.cut(welding_groove)
     #     right_shape = right_shape.cut(welding_groove)
 
-    left_shell = doc.addObject("Part::Feature", "Left_Half")
-    left_shell.Shape = left_shape
+    return left_shape, right_shape
+
+
+def text_cache_path(text, size, x_offset, y_offset):
+    """Returns the .brep cache path of an engraved text
+
+    The key is every text parameter plus the source of build_text_engraving():
+    any change to the glyph construction code gives a new key. Returns None
+    when that source cannot be read, which disables the cache.
+    """
+    try:
+        source = inspect.getsource(build_text_engraving)
+    except (OSError, TypeError):
+        return None
+
+    params = (source, text, TEXT_FONT, size, TEXT_DEPTH, x_offset, y_offset, OUTER_HEIGHT, BOOLEAN_FUZZY_VALUE)
+    key = hashlib.sha1(repr(params).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"atlog_text_{key}.brep")
+
+
+def halves_cache_paths():
+    """Returns the (left, right) .brep cache paths of the halves before engraving
+
+    The key is the source of this macro without its TEXT* settings: any change
+    to the shell code or parameters gives a new key, while editing only the
+    texts reuses the cached halves. Returns None when the source file cannot
+    be read (no __file__), which disables the cache.
+    """
+    try:
+        with open(__file__, encoding="utf-8") as f:
+            source = f.read()
+    except (NameError, OSError):
+        return None
+
+    shell_source = "".join(
+        line for line in source.splitlines(keepends=True) if not re.match(r"TEXT\w*\s*=", line)
+    )
+    key = hashlib.sha1(shell_source.encode()).hexdigest()
+    base = os.path.join(CACHE_DIR, f"atlog_halves_{key}")
+    return base + "_left.brep", base + "_right.brep"
+
+
+def load_cached_halves(paths):
+    """Reads the (left, right) halves from the cache, returns None on a miss"""
+    if paths is None or not all(os.path.exists(path) for path in paths):
+        return None
+
+    halves = []
+    for path in paths:
+        try:
+            shape = Part.Shape()
+            shape.read(path)
+        except Exception as e:
+            print(f"  Warning: Halves cache unreadable, rebuilding: {e}")
+            return None
+        if shape.isNull():
+            return None
+        halves.append(shape)
+
+    return tuple(halves)
+
+
+def save_cached_halves(paths, halves):
+    """Writes the (left, right) halves to the cache"""
+    if paths is None:
+        return
+    for path, shape in zip(paths, halves):
+        try:
+            shape.exportBrep(path)
+        except Exception as e:
+            print(f"  Warning: Halves cache not written: {e}")
+
+
+def build_halves(doc):
+    """Builds the frame, splits it and cuts the ports, kickstand and vents
+
+    Returns (left, right, clean) with the shapes before text engraving, clean
+    being False when the frame needed a fallback (see create_frame_shell).
+    """
+    print("Creating complete frame...")
+    complete_frame, clean = create_frame_shell(doc)
+
+    print("Cutting into two halves...")
+    left_half, right_half = cut_frame_in_half(doc, complete_frame)
+    del complete_frame  # the fillet passes and the split are over
+
+    print("Adding port cutouts...")
+    # Add cutouts on the left part
+    left_cutouts = create_all_cutouts_left(doc)
+
+    # Add ventilation cutouts (common to both halves)
+    vent_cutouts = create_ventilation_cutouts_top(doc)
+    left_cutouts.extend(vent_cutouts)
+
+    # Right part: also add ventilation
+    right_cutouts = create_all_cutouts_right(doc)
+    right_cutouts.extend(vent_cutouts)
+
+    return apply_cutouts(left_half, left_cutouts), apply_cutouts(right_half, right_cutouts), clean
+
+
+def apply_cutouts(shape, cutouts):
+    """Cuts all cutouts from a half in a single boolean
+
+    All cutouts go to OCCT as the tool group of one cut instead of being fused
+    pairwise first (tools may overlap, e.g. kickstand and port 2). The two
+    halves are cut one after the other on purpose: FreeCAD holds the GIL during
+    Part booleans, so Python threads would not overlap them, and a multi-tool
+    cut already runs OCCT in parallel mode.
+    """
+    if not cutouts:
+        return shape
+    return shape.cut(cutouts, BOOLEAN_FUZZY_VALUE)
+
+
+def make_glyph_face(char_wires):
+    """Creates the face of one glyph from its outline wires, normal along +Z
 
-    right_shell = doc.addObject("Part::Feature", "Right_Half")
-    right_shell.Shape = right_shape
+    Uses FaceMakerBullseye for proper handling of letters with holes (A, O, etc.);
+    glyphs made of a single outline (T, L, G...) have no hole to classify. The
+    outlines are mirrored, so the face normal may point down: it is flipped
+    here, for every glyph, so that the extrusion towards +Z gives a solid
+    oriented outward.
+    """
+    if len(char_wires) == 1:
+        face = Part.Face(char_wires[0])
+    else:
+        face = Part.makeFace(char_wires, "Part::FaceMakerBullseye")
 
-    return left_shell, right_shell
+    if face.normalAt(0, 0).z < 0:
+        face.reverse()
+    return face
 
 
 def create_text_engraving(text, size, x_offset, y_offset):
+    """Returns the engraved text solid, from the .brep cache when parameters are unchanged"""
+    path = text_cache_path(text, size, x_offset, y_offset)
+
+    if path is not None and os.path.exists(path):
+        try:
+            text_shape = Part.Shape()
+            text_shape.read(path)
+            if not text_shape.isNull():
+                print(f"  '{text}' loaded from cache: {path}")
+                return text_shape
+        except Exception as e:
+            print(f"  Warning: Text cache unreadable, rebuilding: {e}")
+
+    text_shape, complete = build_text_engraving(text, size, x_offset, y_offset)
+
+    if text_shape is None:
+        return None
+
+    # A text built through the outer contour fallback lost the holes of some
+    # glyphs (or whole glyphs): it is used for this run only, never cached
+    if not complete:
+        print(f"  Warning: '{text}' not cached, some glyphs were not built properly")
+        return text_shape
+
+    if path is None:
+        return text_shape
+
+    try:
+        text_shape.exportBrep(path)
+    except Exception as e:
+        print(f"  Warning: Text cache not written: {e}")
+
+    return text_shape
+
+
+def build_text_engraving(text, size, x_offset, y_offset):
     """Creates engraved text solid for cutting into the back surface (z=0).
 
     The text is mirrored in X so it reads correctly when viewed from outside
-    the shell (looking at z=0 from the -Z direction).
+    the shell (looking at z=0 from the -Z direction). Returns (shape, complete),
+    complete being False when a glyph fell back to its outer contour.
     """
-    cavity_height = TABLET_HEIGHT + 2 * CLEARANCE
-    outer_height = cavity_height + 2 * SHELL_THICKNESS
-
     # Generate text wire outlines from font
     wires = Part.makeWireString(text, TEXT_FONT, size, 0)
     if not wires:
         print(f"  ERROR: Could not generate text '{text}' with font {TEXT_FONT}")
-        return None
+        return None, False
+
+    # Mirror horizontally so text reads correctly from outside (-Z view)
+    # The flat outlines are mirrored before any face is built, which is much
+    # cheaper than mirroring the fused solid. The mirror plane goes through the
+    # bounding box center, so the box is unchanged by the mirror and only moved
+    # by the translation below: compute it once, from the wires
+    bbox = App.BoundBox()
+    for char_wires in wires:
+        for wire in char_wires:
+            bbox.add(wire.BoundBox)
+    center_x = (bbox.XMin + bbox.XMax) / 2
+    wires = [
+        [wire.mirror(App.Vector(center_x, 0, 0), App.Vector(1, 0, 0)) for wire in char_wires]
+        for char_wires in wires
+    ]
 
     # Convert each character's wires to a face, then extrude
-    # Use FaceMakerBullseye for proper handling of letters with holes (A, O, etc.)
     char_solids = []
+    complete = True
     for char_wires in wires:
         if not char_wires:
             continue
         try:
-            face = Part.makeFace(char_wires, "Part::FaceMakerBullseye")
+            face = make_glyph_face(char_wires)
             solid = face.extrude(App.Vector(0, 0, TEXT_DEPTH + 0.2))
             char_solids.append(solid)
         except Exception as e:
-            print(f"  Warning: FaceMakerBullseye failed: {e}")
+            print(f"  Warning: face creation failed: {e}")
+            complete = False
             # Fallback: use only the outer contour (first wire)
             try:
-                face = Part.Face(Part.Wire(char_wires[0].Edges))
+                face = make_glyph_face([Part.Wire(char_wires[0].Edges)])
                 solid = face.extrude(App.Vector(0, 0, TEXT_DEPTH + 0.2))
                 char_solids.append(solid)
             except Exception as e2:
@@ -584,36 +900,28 @@ def create_text_engraving(text, size, x_offset, y_offset):
 
     if not char_solids:
         print(f"  ERROR: No character solids created for '{text}'")
-        return None
+        return None, False
 
-    # Fuse all characters into one solid
+    # Fuse all characters into one solid, in a single multi-argument boolean
+    # (kerned glyphs may touch, so they are fused rather than just compounded)
     text_shape = char_solids[0]
-    for solid in char_solids[1:]:
-        text_shape = text_shape.fuse(solid)
-
-    # Mirror horizontally so text reads correctly from outside (-Z view)
-    bbox = text_shape.BoundBox
-    center_x = (bbox.XMin + bbox.XMax) / 2
-    text_shape = text_shape.mirror(App.Vector(center_x, 0, 0), App.Vector(1, 0, 0))
-
-    # Recompute bounding box after mirror
-    bbox = text_shape.BoundBox
+    if len(char_solids) > 1:
+        text_shape = text_shape.fuse(char_solids[1:], BOOLEAN_FUZZY_VALUE)
 
     # Position in the top-left solid area of the back
     target_x = x_offset
-    target_y = outer_height - y_offset - size
+    target_y = OUTER_HEIGHT - y_offset - size
 
     text_shape.translate(App.Vector(
         target_x - bbox.XMin,
         target_y - bbox.YMin,
-        -0.1 - bbox.ZMin,  # slightly below z=0 for clean boolean cut
+        -0.1 - bbox.ZMin,  # slightly below z=0 for clean boolean cut (outlines lie at z=0)
     ))
 
-    bbox = text_shape.BoundBox
     print(f"  '{text}' at x={target_x:.1f}, y={target_y:.1f}, size={size}mm")
     print(f"  Dimensions: {bbox.XLength:.1f} x {bbox.YLength:.1f} mm")
 
-    return text_shape
+    return text_shape, complete
 
 
 def main():
@@ -623,67 +931,62 @@ def main():
 
     print("=== Z13 SHELL WITH ATLOG ENGRAVING ===\n")
 
-    print("Creating complete frame...")
-    complete_frame = create_frame_shell(doc)
-
-    print("Cutting into two halves...")
-    left_half, right_half = cut_frame_in_half(doc, complete_frame)
-
-    print("Adding port cutouts...")
-    # Add cutouts on the left part
-    left_cutouts = create_all_cutouts_left(doc)
-
-    # Add ventilation cutouts (common to both halves)
-    vent_cutouts = create_ventilation_cutouts_top(doc)
-    left_cutouts.extend(vent_cutouts)
-
-    if left_cutouts:
-        all_left_cuts = left_cutouts[0]
-        for cutout in left_cutouts[1:]:
-            all_left_cuts = all_left_cuts.fuse(cutout)
-        left_final_shape = left_half.Shape.cut(all_left_cuts)
+    # The whole build is one undo step, and only the two final halves become
+    # document objects: the frame and the uncut halves stay plain shapes
+    doc.openTransaction("Build Z13 shell")
+
+    # Only the texts usually change between runs: the halves before engraving
+    # are cached, so that the text cut is the only boolean left to run
+    cache_paths = halves_cache_paths()
+    halves = load_cached_halves(cache_paths)
+    if halves is not None:
+        print("Halves loaded from cache (shell unchanged, only the texts are cut)")
+        left_final_shape, right_final_shape = halves
     else:
-        left_final_shape = left_half.Shape
-
-    # --- Text engravings (separate cuts to avoid fuse issues with mixed geometry) ---
+        left_final_shape, right_final_shape, clean = build_halves(doc)
+        # Halves built through a fallback are not cached, otherwise the next
+        # text-only runs would silently reuse them without the warnings
+        if clean:
+            save_cached_halves(cache_paths, (left_final_shape, right_final_shape))
+        else:
+            print("  Warning: Halves not cached, the frame needed a fallback")
+    del halves
+
+    # --- Text engravings: one multi-tool cut on the left half ---
     print("Adding text engravings...")
+    text_engravings = []
     for txt, sz, xo, yo in [
         (TEXT1_STRING, TEXT1_SIZE, TEXT1_X_OFFSET, TEXT1_Y_OFFSET),
         (TEXT2_STRING, TEXT2_SIZE, TEXT2_X_OFFSET, TEXT2_Y_OFFSET),
     ]:
         engrave = create_text_engraving(txt, sz, xo, yo)
         if engrave:
-            left_final_shape = left_final_shape.cut(engrave)
+            text_engravings.append(engrave)
+
+    left_final_shape = apply_cutouts(left_final_shape, text_engravings)
+    del text_engravings, engrave
 
     left_final = doc.addObject("Part::Feature", "Left_Half_Final")
     left_final.Shape = left_final_shape
 
-    # Right part: also add ventilation
-    right_cutouts = create_all_cutouts_right(doc)
-    right_cutouts.extend(vent_cutouts)
-
-    if right_cutouts:
-        all_right_cuts = right_cutouts[0]
-        for cutout in right_cutouts[1:]:
-            all_right_cuts = all_right_cuts.fuse(cutout)
-        right_final_shape = right_half.Shape.cut(all_right_cuts)
-        right_final = doc.addObject("Part::Feature", "Right_Half_Final")
-        right_final.Shape = right_final_shape
-    else:
-        right_final = right_half
-
-    # Hide complete frame and base halves
-    complete_frame.ViewObject.Visibility = False
-    left_half.ViewObject.Visibility = False
-    right_half.ViewObject.Visibility = False
+    right_final = doc.addObject("Part::Feature", "Right_Half_Final")
+    right_final.Shape = right_final_shape
 
     # Space the two halves for visualization
     right_final.Placement = App.Placement(
-        App.Vector((TABLET_WIDTH + 2*CLEARANCE + 2*SHELL_THICKNESS)/2 + 10, 0, 0),
+        App.Vector(OUTER_WIDTH/2 + 10, 0, 0),
         App.Rotation(App.Vector(0,0,1), 0)
     )
 
-    doc.recompute()
+    doc.commitTransaction()
+
+    # Only the GUI needs the document recomputed (to refresh the 3D view).
+    # Headless, the shapes are already final: export them straight away
+    if getattr(App, "GuiUp", False):
+        doc.recompute()
+    else:
+        Part.export([left_final, right_final], STEP_EXPORT_FILE)
+        print(f"Exported to {os.path.abspath(STEP_EXPORT_FILE)}")
 
     print("\n=== SHELL WITH TEXT ENGRAVINGS READY ===")
     print(f"'{TEXT1_STRING}' ({TEXT1_SIZE}mm) + '{TEXT2_STRING}' ({TEXT2_SIZE}mm)")